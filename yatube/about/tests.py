@@ -0,0 +1,37 @@
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+User = get_user_model()
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=None)
+class AboutCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        cache.clear()
+
+    def test_pages_cached_per_login_state(self):
+        """Страницы кешируются отдельно для гостя и пользователя."""
+        for name in ('about:author', 'about:tech'):
+            url = reverse(name)
+            with self.subTest(url=url):
+                guest = self.guest_client.get(url)
+                self.assertIn('public', guest['Cache-Control'])
+                self.assertNotIn('Пользователь: auth', guest.content.decode())
+                with self.assertNumQueries(0):
+                    again = self.guest_client.get(url)
+                self.assertEqual(guest.content, again.content)
+                authorized = self.authorized_client.get(url)
+                self.assertIn('private', authorized['Cache-Control'])
+                self.assertIn(
+                    'Пользователь: auth', authorized.content.decode()
+                )
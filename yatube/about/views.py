@@ -1,9 +1,49 @@
+from datetime import datetime
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from django.views.generic.base import TemplateView
 
+PAGE_TIMEOUT = 60 * 60 * 24
+
+
+class CachedTemplateView(TemplateView):
+    """Статичная страница, отрендеренная один раз на вариант шапки.
+
+    Содержимое зависит только от входа пользователя (и его имени
+    в шапке), поэтому готовый HTML берётся из кеша, а браузеру
+    разрешено хранить страницу долго.
+    """
+
+    def variant(self):
+        user = self.request.user
+        if user.is_authenticated:
+            return f'user:{user.pk}:{user.username}'
+        return 'anon'
+
+    def get(self, request, *args, **kwargs):
+        key = (
+            f'page:{self.template_name}:{datetime.now().year}:'
+            f'{self.variant()}'
+        )
+        content = cache.get(key)
+        if content is None:
+            response = super().get(request, *args, **kwargs)
+            content = response.render().content
+            cache.set(key, content, PAGE_TIMEOUT)
+        response = HttpResponse(content)
+        patch_vary_headers(response, ('Cookie',))
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, max_age=PAGE_TIMEOUT)
+        else:
+            patch_cache_control(response, public=True, max_age=PAGE_TIMEOUT)
+        return response
+
 
-class AboutAuthorView(TemplateView):
+class AboutAuthorView(CachedTemplateView):
     template_name = 'about/author.html'
 
 
-class AboutTechView(TemplateView):
+class AboutTechView(CachedTemplateView):
     template_name = 'about/tech.html'
@@ -0,0 +1,32 @@
+from django.contrib import admin
+
+from .models import Invalidation, Job, OutboxMessage
+
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'subject', 'created', 'attempts', 'sent')
+    list_filter = ('sent',)
+    readonly_fields = ('created',)
+
+
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'func', 'status', 'priority', 'attempts', 'created')
+    list_filter = ('status',)
+    # Части одной пакетной операции ищутся по её id в аргументах.
+    search_fields = ('args',)
+    readonly_fields = ('created',)
+
+
+admin.site.register(Job, JobAdmin)
+
+
+class InvalidationAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'tag', 'node', 'created')
+    search_fields = ('tag',)
+    readonly_fields = ('created',)
+
+
+admin.site.register(Invalidation, InvalidationAdmin)
@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .invalidation import publish, subscribe
+
+# QuerySet.update() на пользователях идёт мимо сигналов: такие правки
+# доходят до сессий только по истечении таймаута, поэтому он короткий.
+USER_CACHE_TIMEOUT = 60
+USER_TAG_PREFIX = 'user:'
+
+User = get_user_model()
+
+
+def user_cache_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кеша.
+
+    AuthenticationMiddleware вызывает get_user() на каждый запрос
+    вошедшего пользователя; кеш избавляет от SELECT по auth_user.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, created=False, update_fields=None,
+                       **kwargs):
+    # Нового пользователя в кеше ещё нет, а вход сохраняет только
+    # last_login: ради них не сбрасываем кеш на всех узлах во время
+    # волны входов и регистраций.
+    if created or update_fields and set(update_fields) <= {'last_login'}:
+        return
+    # Через шину: смена пароля или is_active должна дойти до всех
+    # воркеров, а не только до локального кеша этого процесса.
+    publish(f'{USER_TAG_PREFIX}{instance.pk}')
+
+
+@subscribe
+def evict_users(tags):
+    cache.delete_many([
+        user_cache_key(tag[len(USER_TAG_PREFIX):])
+        for tag in tags if tag.startswith(USER_TAG_PREFIX)
+    ])
@@ -0,0 +1,16 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def enable_sqlite_wal(sender, connection, **kwargs):
+    """Включает WAL для SQLite: читатели не ждут писателя.
+
+    Нужен очереди задач и счётчикам, которые пишут параллельно
+    с обработкой запросов.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
@@ -0,0 +1,70 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher
+)
+
+_slots = {}
+_slots_lock = threading.Lock()
+_local = threading.local()
+
+
+class HashingOverloaded(Exception):
+    """Все слоты хеширования заняты дольше допустимого ожидания."""
+
+
+def _semaphore():
+    limit = settings.PASSWORD_HASHING_CONCURRENCY
+    with _slots_lock:
+        if limit not in _slots:
+            _slots[limit] = threading.BoundedSemaphore(limit)
+        return _slots[limit]
+
+
+@contextmanager
+def hashing_slot():
+    """Ограничивает число одновременных хеширований в процессе.
+
+    Запрос ждёт свободный слот не дольше
+    PASSWORD_HASHING_QUEUE_TIMEOUT секунд, затем получает
+    HashingOverloaded (ответ 503). Вложенные вызовы того же потока
+    (verify вызывает encode) слот повторно не занимают.
+    """
+    if getattr(_local, 'depth', 0):
+        _local.depth += 1
+        try:
+            yield
+        finally:
+            _local.depth -= 1
+        return
+    semaphore = _semaphore()
+    if not semaphore.acquire(
+        timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT
+    ):
+        raise HashingOverloaded
+    _local.depth = 1
+    try:
+        yield
+    finally:
+        _local.depth = 0
+        semaphore.release()
+
+
+class LimitedHasherMixin:
+    def encode(self, *args, **kwargs):
+        with hashing_slot():
+            return super().encode(*args, **kwargs)
+
+    def verify(self, password, encoded):
+        with hashing_slot():
+            return super().verify(password, encoded)
+
+
+class LimitedPBKDF2PasswordHasher(LimitedHasherMixin, PBKDF2PasswordHasher):
+    pass
+
+
+class LimitedArgon2PasswordHasher(LimitedHasherMixin, Argon2PasswordHasher):
+    pass
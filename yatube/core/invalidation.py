@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Invalidation
+
+TAG_PREFIX = 'tag:'
+RETENTION = timedelta(hours=1)
+PRUNE_INTERVAL = 60 * 5
+
+# Узел — это процесс: у каждого свой LocMemCache.
+NODE = uuid.uuid4().hex
+
+_subscribers = []
+_local = threading.local()
+_lock = threading.Lock()
+_state = {'last_id': None, 'polled_at': 0, 'pruned_at': 0, 'sequence': 0}
+
+
+def _after_fork():
+    # Воркеры, загруженные до fork (preload), иначе делили бы один NODE
+    # и пропускали сбросы друг друга как свои.
+    global NODE
+    NODE = uuid.uuid4().hex
+    _state.update(last_id=None, polled_at=0)
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def subscribe(callback):
+    """Регистрирует callback(tags), который вычищает свои кеши.
+
+    Вызывается и для своих сбросов, и для пришедших с других узлов.
+    Можно использовать как декоратор.
+    """
+    _subscribers.append(callback)
+    return callback
+
+
+def _tag_key(tag):
+    return TAG_PREFIX + tag
+
+
+def tag_tokens(tags):
+    """Текущие метки тегов; отсутствующие заводятся заново."""
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: token for key, token in found.items()}
+
+
+def sequence():
+    """Счётчик сбросов на этом узле: меняется при любом сбросе."""
+    return _state['sequence']
+
+
+def set_tagged(key, value, tags, timeout, tokens=None):
+    """Кладёт value в кеш вместе с метками тегов, от которых оно зависит.
+
+    tokens можно снять заранее через tag_tokens() до построения
+    значения: тогда сброс, пришедший во время построения, не даст
+    сохранить устаревший результат как свежий.
+    """
+    tokens = tokens if tokens is not None else tag_tokens(tags)
+    cache.set(key, (value, tokens), timeout)
+
+
+def get_tagged(key):
+    """Значение из кеша или None, если какой-то из его тегов сброшен."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    value, tokens = entry
+    return value if tokens_valid(tokens) else None
+
+
+def tokens_valid(tokens):
+    """Не сброшен ли с момента снятия меток ни один из тегов."""
+    if not tokens:
+        return True
+    current = cache.get_many([_tag_key(tag) for tag in tokens])
+    return all(
+        current.get(_tag_key(tag)) == token for tag, token in tokens.items()
+    )
+
+
+def _apply(tags):
+    """Сбрасывает теги в локальном кеше и зовёт подписчиков."""
+    cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+    _state['sequence'] += 1
+    for callback in _subscribers:
+        callback(tags)
+
+
+def publish(*tags):
+    """Сбрасывает теги здесь и сообщает о них остальным узлам.
+
+    Внутри транзакции теги сбрасываются сразу и ещё раз после
+    коммита: пока данные не закоммичены, другой запрос может собрать
+    страницу из старых данных под новыми метками. Внутри
+    invalidation_batch() теги копятся и публикуются одним пакетом
+    при выходе из внешнего блока. С выключенным опросом узел один,
+    и журнал не пишется.
+    """
+    tags = set(tags)
+    if not tags:
+        return
+    if getattr(_local, 'depth', 0):
+        _local.pending |= tags
+        return
+    _apply(tags)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _apply(tags))
+    if settings.INVALIDATION_POLL_INTERVAL is None:
+        return
+    Invalidation.objects.bulk_create(
+        [Invalidation(tag=tag, node=NODE) for tag in sorted(tags)]
+    )
+    _prune_if_due()
+
+
+def _prune_if_due():
+    """Удаляет старые события журнала не чаще PRUNE_INTERVAL.
+
+    Зовётся и из publish(): процессы, которые только пишут
+    (import_ndjson, run_jobs), тоже не дают журналу расти.
+    Последнюю строку не удаляем: иначе SQLite начнёт id заново
+    и узлы с большим last_id пропустят новые сбросы.
+    """
+    now = time.monotonic()
+    with _lock:
+        if now - _state['pruned_at'] < PRUNE_INTERVAL:
+            return
+        _state['pruned_at'] = now
+    last = Invalidation.objects.aggregate(last=Max('pk'))['last']
+    if last is not None:
+        Invalidation.objects.filter(
+            created__lt=timezone.now() - RETENTION, pk__lt=last
+        ).delete()
+
+
+@contextmanager
+def invalidation_batch():
+    """Копит сбросы внутри блока и публикует их один раз в конце.
+
+    Для пакетных операций: удаление тысячи постов не должно
+    тысячу раз сбрасывать кеши и писать тысячу событий.
+    """
+    if not getattr(_local, 'depth', 0):
+        _local.pending = set()
+    _local.depth = getattr(_local, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _local.depth -= 1
+        if not _local.depth:
+            publish(*_local.pending)
+
+
+def poll(force=False):
+    """Применяет сбросы, опубликованные другими узлами.
+
+    Читает журнал дальше последнего увиденного id, не чаще
+    INVALIDATION_POLL_INTERVAL секунд; None отключает опрос для
+    единственного узла. При первом вызове узел начинает с конца
+    журнала: его кеш ещё пуст. Возвращает число применённых тегов.
+    """
+    interval = settings.INVALIDATION_POLL_INTERVAL
+    if interval is None and not force:
+        return 0
+    now = time.monotonic()
+    with _lock:
+        if not force and now - _state['polled_at'] < interval:
+            return 0
+        _state['polled_at'] = now
+        if _state['last_id'] is None:
+            _state['last_id'] = Invalidation.objects.aggregate(
+                last=Max('pk')
+            )['last'] or 0
+            return 0
+        rows = list(
+            Invalidation.objects.filter(pk__gt=_state['last_id'])
+            .order_by('pk').values_list('pk', 'tag', 'node')
+        )
+        if rows:
+            _state['last_id'] = rows[-1][0]
+    tags = {tag for _, tag, node in rows if node != NODE}
+    if tags:
+        _apply(tags)
+    _prune_if_due()
+    return len(tags)
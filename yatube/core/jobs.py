@@ -0,0 +1,129 @@
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+VISIBILITY_TIMEOUT = 60
+BACKOFF_BASE = 10
+BATCH_SIZE = 100
+
+
+def _func_path(func):
+    if isinstance(func, str):
+        return func
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def _build(func, args=(), kwargs=None, priority=0, delay=0,
+           max_attempts=3):
+    return Job(
+        func=_func_path(func),
+        args=json.dumps(list(args)),
+        kwargs=json.dumps(kwargs or {}),
+        priority=priority,
+        run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts,
+    )
+
+
+def enqueue(func, *args, priority=0, delay=0, max_attempts=3, **kwargs):
+    """Ставит вызов func(*args, **kwargs) в очередь.
+
+    func — функция уровня модуля или её полный путь; аргументы
+    должны сериализоваться в JSON. Задачи с большим priority
+    выполняются раньше.
+    """
+    job = _build(func, args, kwargs, priority, delay, max_attempts)
+    job.save()
+    return job
+
+
+def enqueue_many(func, args_list, priority=0):
+    """Ставит в очередь много вызовов одной функции одним INSERT."""
+    return Job.objects.bulk_create(
+        [_build(func, args, priority=priority) for args in args_list],
+        batch_size=500,
+    )
+
+
+def claim(batch_size=BATCH_SIZE, visibility_timeout=VISIBILITY_TIMEOUT):
+    """Забирает пачку готовых задач для этого воркера.
+
+    Задача помечается меткой воркера и скрывается от остальных
+    на visibility_timeout секунд; если воркер упал, она снова
+    станет доступной после истечения срока.
+    """
+    now = timezone.now()
+    available = Q(status=Job.QUEUED, run_after__lte=now) & (
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    ids = list(
+        Job.objects.filter(available)
+        .order_by('-priority', 'pk')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    owner = uuid.uuid4().hex
+    Job.objects.filter(available, pk__in=ids).update(
+        owner=owner,
+        locked_until=now + timedelta(seconds=visibility_timeout),
+    )
+    return list(Job.objects.filter(owner=owner).order_by('-priority', 'pk'))
+
+
+def _execute(job):
+    try:
+        func = import_string(job.func)
+        func(*json.loads(job.args), **json.loads(job.kwargs))
+    except Exception as error:
+        return job, error
+    return job, None
+
+
+def _fail(job, error):
+    job.attempts += 1
+    job.last_error = repr(error)
+    job.locked_until = None
+    if job.attempts >= job.max_attempts:
+        job.status = Job.FAILED
+    else:
+        job.run_after = timezone.now() + timedelta(
+            seconds=BACKOFF_BASE * 2 ** job.attempts
+        )
+    job.save(update_fields=[
+        'attempts', 'last_error', 'locked_until', 'status', 'run_after'
+    ])
+
+
+def run_batch(executor=None, batch_size=BATCH_SIZE,
+              visibility_timeout=VISIBILITY_TIMEOUT):
+    """Выполняет одну пачку задач; возвращает (успешно, с ошибкой)."""
+    jobs = claim(batch_size, visibility_timeout)
+    if not jobs:
+        return 0, 0
+    results = executor.map(_execute, jobs) if executor else map(
+        _execute, jobs
+    )
+    done = []
+    failed = 0
+    for job, error in results:
+        if error is None:
+            done.append(job.pk)
+        else:
+            failed += 1
+            _fail(job, error)
+    Job.objects.filter(pk__in=done).update(
+        status=Job.DONE, locked_until=None
+    )
+    return len(done), failed
+
+
+def make_executor(threads):
+    return ThreadPoolExecutor(threads) if threads > 1 else None
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import enqueue_many, make_executor, run_batch
+from core.models import Job
+
+
+def noop(number):
+    return number
+
+
+class Command(BaseCommand):
+    help = 'Пропускная способность очереди задач на пустых задачах'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=5000)
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        Job.objects.filter(func=f'{__name__}.noop').delete()
+        started = time.perf_counter()
+        enqueue_many(noop, [(i,) for i in range(options['jobs'])])
+        enqueued = time.perf_counter() - started
+        executor = make_executor(options['threads'])
+        started = time.perf_counter()
+        total = 0
+        while True:
+            done, failed = run_batch(executor, options['batch_size'])
+            if not done and not failed:
+                break
+            total += done
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Постановка: {options["jobs"] / enqueued:.0f} задач/с; '
+            f'выполнение: {total / elapsed:.0f} задач/с '
+            f'({total} задач, {options["threads"]} потоков)'
+        )
+        Job.objects.filter(func=f'{__name__}.noop').delete()
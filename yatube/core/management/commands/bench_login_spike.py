@@ -0,0 +1,97 @@
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Задержка ленты во время всплеска входов с лимитом и без'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/about/tech/')
+        parser.add_argument('--logins', type=int, default=16)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--username', default='bench_login')
+
+    def login_storm(self, stop, username, statuses):
+        client = Client()
+        while not stop.is_set():
+            response = client.post(
+                '/auth/login/',
+                {'username': username, 'password': 'bench-pass-123'}
+            )
+            statuses.append(response.status_code)
+
+    def feed_latency(self, url, seconds):
+        client = Client()
+        timings = []
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def run(self, options, logins):
+        stop = threading.Event()
+        statuses = []
+        threads = [
+            threading.Thread(
+                target=self.login_storm,
+                args=(stop, options['username'], statuses)
+            )
+            for _ in range(logins)
+        ]
+        for thread in threads:
+            thread.start()
+        timings = self.feed_latency(options['url'], options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return timings, statuses
+
+    def report(self, label, timings, statuses):
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if timings else 0
+        self.stdout.write(
+            f'{label}: лента p50 {statistics.median(timings):.1f} мс, '
+            f'p95 {p95:.1f} мс; входов {statuses.count(302)}, '
+            f'503: {statuses.count(503)}'
+        )
+
+    def handle(self, *args, **options):
+        # Пользователь с известным паролем живёт только в тестовой
+        # базе: в рабочей он остался бы открытой учётной записью.
+        # Файл, а не база в памяти: параллельные входы пишут в неё,
+        # а общая база SQLite в памяти на это отвечает «table is locked».
+        name = connection.settings_dict['NAME']
+        directory = tempfile.mkdtemp()
+        connection.settings_dict['TEST']['NAME'] = os.path.join(
+            directory, 'bench_login.sqlite3'
+        )
+        connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            self.bench(options)
+        finally:
+            connection.creation.destroy_test_db(name, verbosity=0)
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def bench(self, options):
+        User.objects.create_user(
+            username=options['username'], password='bench-pass-123'
+        )
+        self.report('без всплеска', *self.run(options, 0))
+        with override_settings(
+            PASSWORD_HASHING_CONCURRENCY=options['logins']
+        ):
+            self.report('без лимита', *self.run(options, options['logins']))
+        self.report('с лимитом', *self.run(options, options['logins']))
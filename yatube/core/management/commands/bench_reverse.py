@@ -0,0 +1,60 @@
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+
+HEADER = (
+    "{% url 'posts:index' %}{% url 'about:author' %}{% url 'about:tech' %}"
+    "{% url 'users:login' %}{% url 'users:signup' %}"
+)
+POSTS = (
+    "{% for post in posts %}"
+    "{% url 'posts:profile' post.author.username %}"
+    "{% url 'posts:post_detail' post.id %}"
+    "{% url 'posts:group_list' post.group.slug %}"
+    "{% endfor %}"
+)
+COMMENTS = (
+    "{% for comment in comments %}"
+    "{% url 'posts:profile' comment.author.username %}"
+    "{% endfor %}"
+)
+SOURCE = HEADER + POSTS + COMMENTS
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает {% url %} и {% url_fast %} на странице поста'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def bench(self, template, context, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            template.render(context)
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def handle(self, *args, **options):
+        author = SimpleNamespace(username='автор')
+        group = SimpleNamespace(slug='group')
+        context = Context({
+            'posts': [
+                SimpleNamespace(id=i, author=author, group=group)
+                for i in range(10)
+            ],
+            'comments': [
+                SimpleNamespace(author=author) for _ in range(100)
+            ],
+        })
+        templates = {
+            '{% url %}': Template(SOURCE),
+            '{% url_fast %}': Template(
+                '{% load fast_urls %}'
+                + SOURCE.replace('{% url ', '{% url_fast ')
+            ),
+        }
+        self.stdout.write('10 постов, 100 комментариев, 5 ссылок меню')
+        for label, template in templates.items():
+            elapsed = self.bench(template, context, options['repeat'])
+            self.stdout.write(f'{label}: {elapsed:.3f} мс на страницу')
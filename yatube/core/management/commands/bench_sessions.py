@@ -0,0 +1,66 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+    'django.contrib.sessions.backends.signed_cookies',
+)
+BACKENDS = {
+    'ModelBackend': 'django.contrib.auth.backends.ModelBackend',
+    'CachedModelBackend': 'core.backends.CachedModelBackend',
+}
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Задержка запросов вошедшего пользователя по видам сессий'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='/follow/')
+        parser.add_argument('--repeat', type=int, default=200)
+        parser.add_argument('--username', default='bench_sessions')
+
+    def bench(self, user, url, repeat):
+        client = Client()
+        client.force_login(user)
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for _ in range(repeat):
+                client.get(url)
+            elapsed = time.perf_counter() - started
+        return elapsed / repeat * 1000, len(queries) / repeat
+
+    def handle(self, *args, **options):
+        # Пользователь замера создаётся в тестовой базе, а не в рабочей.
+        name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            self.run(options)
+        finally:
+            connection.creation.destroy_test_db(name, verbosity=0)
+
+    def run(self, options):
+        user = User.objects.create_user(username=options['username'])
+        for engine in ENGINES:
+            for label, backend in BACKENDS.items():
+                cache.clear()
+                with override_settings(
+                    SESSION_ENGINE=engine,
+                    AUTHENTICATION_BACKENDS=[backend],
+                ):
+                    elapsed, queries = self.bench(
+                        user, options['url'], options['repeat']
+                    )
+                self.stdout.write(
+                    f'{engine.rsplit(".", 1)[1]:16} {label:18} '
+                    f'{elapsed:.2f} мс, {queries:.1f} запросов к БД'
+                )
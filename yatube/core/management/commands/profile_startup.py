@@ -0,0 +1,79 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TARGETS = {
+    'wsgi': 'from yatube.wsgi import application',
+    'setup': 'import django; django.setup()',
+}
+
+
+def parse_importtime(stderr):
+    """Строки -X importtime -> [(модуль, своё время мкс, общее мкс)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, total, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(own), int(total)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = ('Время холодного старта воркера и разбивка импорта по '
+            'пакетам (python -X importtime)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=TARGETS, default='wsgi')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument(
+            '--budget-ms', type=float, default=settings.STARTUP_BUDGET_MS,
+            help='Ошибка, если медиана старта больше бюджета'
+        )
+
+    def run(self, code, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='yatube.settings')
+        started = time.perf_counter()
+        result = subprocess.run(
+            command + ['-c', code], cwd=settings.BASE_DIR, env=env,
+            stderr=subprocess.PIPE, universal_newlines=True, check=True,
+        )
+        return (time.perf_counter() - started) * 1000, result.stderr
+
+    def handle(self, *args, **options):
+        code = TARGETS[options['target']]
+        baseline = statistics.median(
+            self.run('pass')[0] for _ in range(options['repeat'])
+        )
+        startup = statistics.median(
+            self.run(code)[0] for _ in range(options['repeat'])
+        )
+        rows = parse_importtime(self.run(code, importtime=True)[1])
+        by_package = Counter()
+        for name, own, _ in rows:
+            by_package[name.split('.')[0]] += own
+        total = sum(by_package.values()) or 1
+        self.stdout.write(
+            f'Холодный старт ({options["target"]}): {startup:.0f} мс, '
+            f'из них интерпретатор {baseline:.0f} мс, '
+            f'импорт {total / 1000:.0f} мс'
+        )
+        for package, own in by_package.most_common(options['top']):
+            self.stdout.write(
+                f'  {package:28} {own / 1000:7.1f} мс {own / total:6.1%}'
+            )
+        if startup > options['budget_ms']:
+            raise CommandError(
+                f'Старт {startup:.0f} мс больше бюджета '
+                f'{options["budget_ms"]:.0f} мс'
+            )
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import BATCH_SIZE, VISIBILITY_TIMEOUT, make_executor
+from core.jobs import run_batch
+
+
+class Command(BaseCommand):
+    help = 'Выполняет задачи из очереди core.Job'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--visibility-timeout', type=int, default=VISIBILITY_TIMEOUT
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='работать постоянно, опрашивая очередь'
+        )
+        parser.add_argument('--interval', type=float, default=1)
+
+    def handle(self, *args, **options):
+        executor = make_executor(options['threads'])
+        while True:
+            done, failed = run_batch(
+                executor,
+                options['batch_size'],
+                options['visibility_timeout'],
+            )
+            if done or failed:
+                self.stdout.write(f'Выполнено: {done}, с ошибкой: {failed}')
+            if not done and not failed:
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.outbox import BATCH_SIZE, send_batch
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди OutboxMessage'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='работать постоянно, опрашивая очередь'
+        )
+        parser.add_argument('--interval', type=float, default=2)
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_batch(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f'Отправлено: {sent}, ошибок: {failed}')
+            if not options['loop']:
+                return
+            if sent < options['batch_size']:
+                time.sleep(options['interval'])
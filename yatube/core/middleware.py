@@ -0,0 +1,36 @@
+from django.http import HttpResponse
+
+from .hashers import HashingOverloaded
+from .invalidation import poll
+
+RETRY_AFTER = 5
+
+
+class HashingOverloadMiddleware:
+    """Отвечает 503 вместо ожидания, когда хеширование перегружено."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, HashingOverloaded):
+            response = HttpResponse(
+                'Сервис перегружен, попробуйте позже', status=503
+            )
+            response['Retry-After'] = RETRY_AFTER
+            return response
+        return None
+
+
+class InvalidationMiddleware:
+    """Перед запросом применяет сбросы кеша с других узлов."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        poll()
+        return self.get_response(request)
@@ -0,0 +1,90 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """Письмо, ожидающее отправки фоновым отправителем."""
+
+    subject = models.TextField('Тема')
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    to = models.TextField('Кому (JSON)', default='[]')
+    cc = models.TextField('Копия (JSON)', default='[]')
+    bcc = models.TextField('Скрытая копия (JSON)', default='[]')
+    reply_to = models.TextField('Ответить (JSON)', default='[]')
+    headers = models.TextField('Заголовки (JSON)', default='{}')
+    alternatives = models.TextField('Альтернативы (JSON)', default='[]')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now,
+    )
+    sent = models.DateTimeField('Отправлено', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [models.Index(fields=['sent', 'next_attempt'])]
+
+    def __str__(self):
+        return self.subject
+
+
+class Job(models.Model):
+    """Отложенная задача для фонового воркера, см. core.jobs."""
+
+    QUEUED = 'queued'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'В очереди'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    func = models.CharField('Функция', max_length=255)
+    args = models.TextField('Аргументы (JSON)', default='[]')
+    kwargs = models.TextField('Именованные аргументы (JSON)', default='{}')
+    priority = models.SmallIntegerField('Приоритет', default=0)
+    status = models.CharField(
+        'Статус', max_length=10, choices=STATUSES, default=QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток', default=3
+    )
+    run_after = models.DateTimeField('Не раньше', default=timezone.now)
+    locked_until = models.DateTimeField(
+        'Занята до', null=True, blank=True
+    )
+    owner = models.CharField('Воркер', max_length=64, blank=True)
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        indexes = [
+            models.Index(fields=['status', 'priority', 'run_after']),
+            models.Index(fields=['owner']),
+        ]
+
+    def __str__(self):
+        return f'{self.func} #{self.pk}'
+
+
+class Invalidation(models.Model):
+    """Сброс кеша по тегу для остальных узлов, см. core.invalidation."""
+
+    tag = models.CharField('Тег', max_length=255)
+    node = models.CharField('Узел', max_length=32)
+    created = models.DateTimeField('Создано', auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = 'Сброс кеша'
+        verbose_name_plural = 'Сбросы кеша'
+
+    def __str__(self):
+        return self.tag
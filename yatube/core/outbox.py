@@ -0,0 +1,109 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = 30
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который только кладёт письма в OutboxMessage.
+
+    Запрос (например, сброс пароля) не ждёт почтовый сервер:
+    письма отправляет send_outbox через OUTBOX_EMAIL_BACKEND.
+    Письма с вложениями отклоняются с ValueError.
+    """
+
+    def send_messages(self, email_messages):
+        if any(message.attachments for message in email_messages):
+            raise ValueError('Очередь писем не поддерживает вложения')
+        OutboxMessage.objects.bulk_create([
+            OutboxMessage(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email,
+                to=json.dumps(message.to),
+                cc=json.dumps(message.cc),
+                bcc=json.dumps(message.bcc),
+                reply_to=json.dumps(message.reply_to),
+                headers=json.dumps(message.extra_headers),
+                alternatives=json.dumps(
+                    getattr(message, 'alternatives', [])
+                ),
+            )
+            for message in email_messages
+        ])
+        return len(email_messages)
+
+
+def _as_email(message):
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=json.loads(message.to),
+        cc=json.loads(message.cc),
+        bcc=json.loads(message.bcc),
+        reply_to=json.loads(message.reply_to),
+        headers=json.loads(message.headers),
+    )
+    for content, mimetype in json.loads(message.alternatives):
+        email.attach_alternative(content, mimetype)
+    return email
+
+
+def _defer(message, error, now):
+    message.attempts += 1
+    message.next_attempt = now + timedelta(
+        seconds=BACKOFF_BASE * 2 ** message.attempts
+    )
+    message.last_error = repr(error)
+    message.save(update_fields=['attempts', 'next_attempt', 'last_error'])
+
+
+def send_batch(batch_size=BATCH_SIZE):
+    """Отправляет пачку писем через одно соединение с сервером.
+
+    Неудачные письма откладываются с экспоненциальной задержкой,
+    после MAX_ATTEMPTS попыток больше не выбираются. Если не удалось
+    даже подключиться к серверу, попытка засчитывается всей пачке.
+    Рассчитано на один процесс-отправитель. Возвращает
+    (отправлено, ошибок).
+    """
+    now = timezone.now()
+    messages = list(OutboxMessage.objects.filter(
+        sent__isnull=True,
+        next_attempt__lte=now,
+        attempts__lt=MAX_ATTEMPTS,
+    ).order_by('pk')[:batch_size])
+    if not messages:
+        return 0, 0
+    sent_ids = []
+    failed = 0
+    connection = get_connection(settings.OUTBOX_EMAIL_BACKEND)
+    try:
+        connection.open()
+    except Exception as error:
+        for message in messages:
+            _defer(message, error, now)
+        return 0, len(messages)
+    try:
+        for message in messages:
+            try:
+                connection.send_messages([_as_email(message)])
+            except Exception as error:
+                failed += 1
+                _defer(message, error, now)
+            else:
+                sent_ids.append(message.pk)
+    finally:
+        connection.close()
+    OutboxMessage.objects.filter(pk__in=sent_ids).update(sent=now)
+    return len(sent_ids), failed
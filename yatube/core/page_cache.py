@@ -0,0 +1,102 @@
+import re
+from functools import wraps
+from hashlib import md5
+
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+from .invalidation import get_tagged, publish, sequence, set_tagged
+from .stampede import single_flight
+
+PAGE_TIMEOUT = 60 * 5
+PAGES_TAG = 'pages'
+
+# Персональные части страниц: имя {% hole %} -> шаблон для дорисовки.
+HOLES = {
+    'user_nav': 'includes/user_nav.html',
+    'switcher': 'includes/switcher.html',
+}
+HOLE_RE = re.compile(r'<!--hole:(\w+)-->.*?<!--/hole:\1-->', re.S)
+
+
+def _wrap(name, content=''):
+    return f'<!--hole:{name}-->{content}<!--/hole:{name}-->'
+
+
+def punch_holes(body):
+    """Вырезает персональные части, оставляя пустые маркеры."""
+    return HOLE_RE.sub(lambda match: _wrap(match[1]), body)
+
+
+def fill_holes(body, request):
+    """Дорисовывает персональные части для текущего пользователя."""
+    return HOLE_RE.sub(
+        lambda match: _wrap(
+            match[1], render_to_string(HOLES[match[1]], request=request)
+        ),
+        body
+    )
+
+
+def page_key(full_path):
+    return f'page_body:{md5(full_path.encode()).hexdigest()}'
+
+
+def bump_page_version():
+    """Делает недействительными все закешированные страницы."""
+    publish(PAGES_TAG)
+
+
+def depends_on(response, *tags):
+    """Помечает ответ тегами, при сбросе которых страница устареет.
+
+    Все страницы и так зависят от PAGES_TAG; теги вида author:42 или
+    group:cats позволяют сбрасывать только затронутые страницы.
+    """
+    response.cache_tags = getattr(response, 'cache_tags', ()) + tags
+    return response
+
+
+def page_cache(timeout=PAGE_TIMEOUT, authenticated=True):
+    """Кеширует тело страницы целиком для GET-запросов.
+
+    Гости получают готовую страницу без рендера; шапка и прочие
+    {% hole %} дорисовываются под текущего пользователя. Если
+    authenticated=False, вошедшим пользователям страница рендерится
+    как обычно: в ней есть персональные части вне дыр (формы, кнопки).
+    Страница живёт, пока не сброшен PAGES_TAG или теги из depends_on().
+    """
+    def decorator(view):
+        def render_and_store(request, key, *args, **kwargs):
+            started = sequence()
+            response = view(request, *args, **kwargs)
+            # Сброс во время рендера мог не попасть в страницу.
+            if (response.status_code == 200 and not response.streaming
+                    and sequence() == started):
+                set_tagged(
+                    key,
+                    punch_holes(response.content.decode()),
+                    (PAGES_TAG,) + getattr(response, 'cache_tags', ()),
+                    timeout,
+                )
+            return response
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or (
+                not authenticated and request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            key = page_key(request.get_full_path())
+            body = get_tagged(key)
+            if body is None:
+                # После сброса страницу рендерит один запрос, остальные
+                # ждут его и берут готовое тело из кеша.
+                with single_flight(key):
+                    body = get_tagged(key)
+                    if body is None:
+                        return render_and_store(request, key, *args,
+                                                **kwargs)
+            return HttpResponse(fill_holes(body, request))
+        return wrapper
+    return decorator
@@ -0,0 +1,75 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)."""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+def _hit(key, limit, period):
+    """Засчитывает запрос; возвращает секунды до сброса или 0.
+
+    Счётчик окна создаётся через add() и растёт атомарным incr(),
+    поэтому одновременные запросы нескольких воркеров не теряются.
+    """
+    now = time.time()
+    window = int(now // period)
+    key = f'ratelimit:{key}:{window}'
+    cache.add(key, 0, period)
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # Окно истекло между add() и incr().
+        cache.add(key, 1, period)
+        count = 1
+    if count > limit:
+        return int((window + 1) * period - now) + 1
+    return 0
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def rate_limit(scope, methods=('POST',)):
+    """Ограничивает частоту запросов к view по пользователю и IP.
+
+    Лимиты берутся из settings.RATE_LIMITS[scope]:
+    {'user': '20/m', 'ip': '100/m'}. При превышении отдаёт 429
+    с заголовком Retry-After.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return view(request, *args, **kwargs)
+            limits = settings.RATE_LIMITS[scope]
+            idents = [('ip', client_ip(request))]
+            if request.user.is_authenticated:
+                idents.append(('user', request.user.pk))
+            retry_after = 0
+            for kind, ident in idents:
+                if kind not in limits:
+                    continue
+                limit, period = parse_rate(limits[kind])
+                retry_after = max(
+                    retry_after,
+                    _hit(f'{scope}:{kind}:{ident}', limit, period)
+                )
+            if retry_after:
+                response = HttpResponse(
+                    'Слишком много запросов, попробуйте позже', status=429
+                )
+                response['Retry-After'] = retry_after
+                return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,116 @@
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+from .invalidation import tag_tokens, tokens_valid
+
+LEASE_PREFIX = 'lease:'
+LEASE_TIMEOUT = 30
+WAIT = 5
+WAIT_STEP = 0.05
+STALE_TTL = 60
+BETA = 1.0
+
+# Полосы блокировок вместо словаря по ключам: память не растёт.
+# RLock: вложенная сборка (страница группы строит свою первую
+# страницу) может попасть в ту же полосу, что и внешняя.
+_locks = [threading.RLock() for _ in range(256)]
+_local = threading.local()
+
+
+def _wait_for_release(lease_key, wait):
+    deadline = time.monotonic() + wait
+    while cache.get(lease_key) is not None and time.monotonic() < deadline:
+        time.sleep(WAIT_STEP)
+
+
+@contextmanager
+def single_flight(key, blocking=True, wait=WAIT):
+    """Даёт перестраивать значение key только одному исполнителю.
+
+    Внутри процесса очередь держит блокировка, между процессами —
+    аренда в кеше (cache.add). Отдаёт True, если можно строить: после
+    ожидания значение стоит перечитать, его мог построить другой.
+    С blocking=False отдаёт False сразу, если строит кто-то другой.
+    Если другой строит дольше wait, строим сами: лучше лишний
+    рендер, чем зависший запрос. Вложенный вызов с тем же ключом
+    в том же потоке сразу отдаёт True.
+    """
+    held = _local.__dict__.setdefault('keys', set())
+    if key in held:
+        yield True
+        return
+    lock = _locks[hash(key) % len(_locks)]
+    if not lock.acquire(blocking, wait if blocking else -1):
+        yield False
+        return
+    lease_key = LEASE_PREFIX + key
+    locked = True
+    leased = cache.add(lease_key, True, LEASE_TIMEOUT)
+    if not leased:
+        # Чужую аренду ждём без блокировки: иначе на время ожидания
+        # встали бы все ключи этой полосы.
+        lock.release()
+        locked = False
+        if not blocking:
+            yield False
+            return
+        _wait_for_release(lease_key, wait)
+        locked = lock.acquire(True, wait)
+        leased = cache.add(lease_key, True, LEASE_TIMEOUT)
+    held.add(key)
+    try:
+        yield True
+    finally:
+        held.discard(key)
+        if leased:
+            cache.delete(lease_key)
+        if locked:
+            lock.release()
+
+
+def _fresh(entry, beta):
+    """Свежа ли запись с учётом вероятностного раннего обновления.
+
+    Чем ближе срок и чем дольше строилось значение, тем вероятнее
+    один из запросов решит перестроить его заранее (XFetch), пока
+    остальные ещё получают старое.
+    """
+    _, tokens, expires, delta = entry
+    early = -delta * beta * math.log(1 - random.random())
+    return time.time() + early < expires and tokens_valid(tokens)
+
+
+def cached_call(key, build, timeout, tags=(), beta=BETA, stale=STALE_TTL):
+    """Значение build() из кеша без лавины перестроений.
+
+    Перестраивает один исполнитель на ключ. Пока он строит, остальные
+    получают прежнее значение, даже просроченное или сброшенное по
+    тегу, если оно ещё лежит в кеше (stale-while-revalidate, stale
+    секунд сверх timeout); без прежнего значения — ждут результата.
+    """
+    entry = cache.get(key)
+    if entry is not None and _fresh(entry, beta):
+        return entry[0]
+    with single_flight(key, blocking=entry is None) as leader:
+        if not leader and entry is not None:
+            return entry[0]
+        current = cache.get(key)
+        rebuilt = current is not None and (
+            entry is None or current[2] != entry[2]
+        )
+        if rebuilt and _fresh(current, 0):
+            return current[0]
+        tokens = tag_tokens(tags)
+        started = time.monotonic()
+        value = build()
+        delta = time.monotonic() - started
+        cache.set(
+            key, (value, tokens, time.time() + timeout, delta),
+            timeout + stale
+        )
+        return value
@@ -0,0 +1,33 @@
+from django import template
+
+register = template.Library()
+
+
+class HoleNode(template.Node):
+    def __init__(self, name, nodelist):
+        self.name = name
+        self.nodelist = nodelist
+
+    def render(self, context):
+        return (
+            f'<!--hole:{self.name}-->'
+            f'{self.nodelist.render(context)}'
+            f'<!--/hole:{self.name}-->'
+        )
+
+
+@register.tag
+def hole(parser, token):
+    """Помечает персональную часть страницы: {% hole 'name' %}...{% endhole %}.
+
+    core.page_cache вырезает содержимое перед записью в кеш
+    и дорисовывает его для каждого запроса, см. HOLES.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]} принимает ровно один аргумент'
+        )
+    nodelist = parser.parse(('endhole',))
+    parser.delete_first_token()
+    return HoleNode(bits[1].strip('\'"'), nodelist)
@@ -0,0 +1,511 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.base import BaseEmailBackend
+from django.http import HttpResponse
+from django.core.cache import cache
+from django.test import (
+    Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from . import invalidation
+from .backends import CachedModelBackend
+from .hashers import _semaphore
+from .invalidation import (
+    get_tagged, invalidation_batch, poll, publish, set_tagged, subscribe
+)
+from .jobs import claim, enqueue, run_batch
+from .management.commands.profile_startup import parse_importtime
+from .models import Invalidation, Job, OutboxMessage
+from .outbox import send_batch
+from .ratelimit import rate_limit
+from .reverse import fast_reverse
+from . import stampede
+from .stampede import LEASE_PREFIX, cached_call, single_flight
+
+User = get_user_model()
+
+
+class FastReverseTests(SimpleTestCase):
+    def test_matches_reverse(self):
+        """fast_reverse даёт те же URL, что и reverse()."""
+        cases = (
+            ('posts:index', ()),
+            ('posts:profile', ('автор',)),
+            ('posts:profile', ('user.name+tag@x',)),
+            ('posts:post_detail', (42,)),
+            ('posts:group_list', ('cats',)),
+            ('posts:add_comment', (7,)),
+            ('users:signup', ()),
+            ('users:password_change', ()),
+        )
+        for viewname, args in cases:
+            with self.subTest(viewname=viewname, args=args):
+                for _ in range(2):
+                    self.assertEqual(
+                        fast_reverse(viewname, *args),
+                        reverse(viewname, args=args)
+                    )
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=None)
+class CachedModelBackendTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.get(pk=self.user.pk)
+
+    def test_user_loaded_from_cache(self):
+        """Пользователь сессии читается из кеша до своего изменения."""
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.user.pk), self.user)
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        self.assertEqual(
+            backend.get_user(self.user.pk).first_name, 'Новое имя'
+        )
+
+    def test_inactive_user_rejected(self):
+        """Неактивный пользователь из кеша не проходит проверку."""
+        backend = CachedModelBackend()
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(backend.get_user(self.user.pk))
+
+    def test_authenticated_request(self):
+        """Запрос вошедшего пользователя не читает auth_user."""
+        client = Client()
+        client.force_login(self.user)
+        client.get(reverse('about:tech'))
+        with self.assertNumQueries(0):
+            response = client.get(reverse('about:tech'))
+        self.assertIn('Пользователь: auth', response.content.decode())
+
+    def test_login_does_not_publish(self):
+        """Регистрация и вход не пишут событий в шину, правка — пишет."""
+        with mock.patch('core.backends.publish') as published:
+            user = User.objects.create_user(username='newcomer')
+            Client().force_login(user)
+            published.assert_not_called()
+            self.user.save()
+        published.assert_called_once_with(f'user:{self.user.pk}')
+
+    def test_remote_change_evicts_user(self):
+        """Изменение пользователя на другом узле сбрасывает кеш здесь."""
+        backend = CachedModelBackend()
+        invalidation._state['last_id'] = None
+        poll(force=True)
+        backend.get_user(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        Invalidation.objects.create(tag=f'user:{self.user.pk}', node='другой')
+        poll(force=True)
+        self.assertIsNone(backend.get_user(self.user.pk))
+
+
+class HashingAdmissionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', password='secret-pass-123'
+        )
+
+    def login(self):
+        return Client().post(
+            reverse('users:login'),
+            {'username': 'auth', 'password': 'secret-pass-123'}
+        )
+
+    def test_login_works_with_free_slots(self):
+        self.assertEqual(self.login().status_code, 302)
+
+    @override_settings(PASSWORD_HASHING_QUEUE_TIMEOUT=0)
+    def test_overloaded_hashing_returns_503(self):
+        """Когда все слоты заняты, вход сразу получает 503."""
+        semaphore = _semaphore()
+        for _ in range(2):
+            semaphore.acquire()
+        try:
+            response = self.login()
+        finally:
+            for _ in range(2):
+                semaphore.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+
+@override_settings(RATE_LIMITS={'test': {'ip': '5/d'}})
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.view = rate_limit('test')(lambda request: HttpResponse('ok'))
+
+    def request(self, method='post', ip='10.0.0.1'):
+        request = getattr(RequestFactory(), method)('/', REMOTE_ADDR=ip)
+        request.user = AnonymousUser()
+        return self.view(request)
+
+    def test_concurrent_clients_share_limit(self):
+        """Одновременные клиенты с одного IP вместе получают ровно лимит."""
+        statuses = []
+        threads = [
+            threading.Thread(
+                target=lambda: statuses.append(self.request().status_code)
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(statuses.count(200), 5)
+        self.assertEqual(statuses.count(429), 15)
+        response = self.request()
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_limits_are_per_ip_and_method(self):
+        """Другой IP и GET-запросы не упираются в чужой лимит."""
+        for _ in range(5):
+            self.request()
+        self.assertEqual(self.request().status_code, 429)
+        self.assertEqual(self.request(ip='10.0.0.2').status_code, 200)
+        self.assertEqual(self.request(method='get').status_code, 200)
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('почтовый сервер недоступен')
+
+
+class UnreachableEmailBackend(BaseEmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('нет соединения')
+
+    def send_messages(self, email_messages):
+        raise AssertionError('без соединения отправлять нельзя')
+
+
+@override_settings(
+    EMAIL_BACKEND='core.outbox.OutboxEmailBackend',
+    OUTBOX_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', email='auth@example.com',
+            password='secret-pass-123'
+        )
+
+    def reset_password(self):
+        return Client().post(
+            reverse('users:password_reset'), {'email': 'auth@example.com'}
+        )
+
+    def test_reset_queues_and_sender_delivers(self):
+        """Сброс пароля кладёт письмо в очередь, отправитель его шлёт."""
+        self.reset_password()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(send_batch(), (1, 0))
+        self.assertEqual(mail.outbox[0].to, ['auth@example.com'])
+        self.assertEqual(send_batch(), (0, 0))
+
+    @override_settings(OUTBOX_EMAIL_BACKEND='core.tests.FailingEmailBackend')
+    def test_failed_message_retried_later(self):
+        """Неудачное письмо откладывается с растущей задержкой."""
+        self.reset_password()
+        self.assertEqual(send_batch(), (0, 1))
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.attempts, 1)
+        self.assertIn('ConnectionError', message.last_error)
+        self.assertEqual(send_batch(), (0, 0))
+
+    @override_settings(
+        OUTBOX_EMAIL_BACKEND='core.tests.UnreachableEmailBackend'
+    )
+    def test_unreachable_server_defers_batch(self):
+        """Недоступный сервер откладывает всю пачку, а не роняет её."""
+        self.reset_password()
+        self.reset_password()
+        self.assertEqual(send_batch(), (0, 2))
+        self.assertEqual(
+            list(OutboxMessage.objects.values_list('attempts', flat=True)),
+            [1, 1]
+        )
+
+    def test_copies_and_headers_preserved(self):
+        """Копии, скрытые копии и заголовки доходят как были."""
+        EmailMessage(
+            'Тема', 'Текст', 'from@example.com', ['to@example.com'],
+            cc=['cc@example.com'], bcc=['bcc@example.com'],
+            reply_to=['reply@example.com'], headers={'X-Tag': 'test'},
+        ).send()
+        self.assertEqual(send_batch(), (1, 0))
+        email = mail.outbox[0]
+        self.assertEqual(email.to, ['to@example.com'])
+        self.assertEqual(email.cc, ['cc@example.com'])
+        self.assertEqual(email.bcc, ['bcc@example.com'])
+        self.assertEqual(email.reply_to, ['reply@example.com'])
+        self.assertEqual(email.extra_headers, {'X-Tag': 'test'})
+        self.assertNotIn('bcc@example.com', email.message().as_string())
+
+    def test_attachments_rejected(self):
+        """Письмо с вложением не теряет его молча, а отклоняется."""
+        email = EmailMessage('Тема', 'Текст', to=['to@example.com'])
+        email.attach('a.txt', 'данные', 'text/plain')
+        with self.assertRaises(ValueError):
+            email.send()
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
+CALLS = []
+
+
+def record_call(value, suffix=''):
+    CALLS.append(f'{value}{suffix}')
+
+
+def failing_job():
+    raise RuntimeError('сбой задачи')
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_jobs_run_by_priority(self):
+        """Задачи выполняются по приоритету с аргументами из очереди."""
+        enqueue(record_call, 'низкий')
+        enqueue(record_call, 'высокий', priority=10, suffix='!')
+        enqueue(record_call, 'позже', delay=60)
+        self.assertEqual(run_batch(), (2, 0))
+        self.assertEqual(CALLS, ['высокий!', 'низкий'])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 2)
+
+    def test_failed_job_retried_then_marked_failed(self):
+        job = enqueue(failing_job, max_attempts=2)
+        self.assertEqual(run_batch(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        Job.objects.filter(pk=job.pk).update(run_after=job.created)
+        run_batch()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIn('сбой задачи', job.last_error)
+
+    def test_claimed_job_hidden_until_timeout(self):
+        """Забранная задача невидима другим воркерам до таймаута."""
+        enqueue(record_call, 'x')
+        self.assertEqual(len(claim()), 1)
+        self.assertEqual(claim(), [])
+        Job.objects.update(locked_until=Job.objects.get().created)
+        self.assertEqual(len(claim()), 1)
+
+
+class InvalidationBusTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidation._state['last_id'] = None
+        poll(force=True)
+        self.seen = []
+        subscribe(self.seen.append)
+
+    def tearDown(self):
+        invalidation._subscribers.remove(self.seen.append)
+
+    def test_publish_evicts_tagged_values(self):
+        """Сброс тега убирает только зависящие от него значения."""
+        set_tagged('cats_page', 'коты', ['group:cats', 'pages'], 60)
+        set_tagged('author_page', 'автор', ['author:42', 'pages'], 60)
+        publish('group:cats')
+        self.assertIsNone(get_tagged('cats_page'))
+        self.assertEqual(get_tagged('author_page'), 'автор')
+        self.assertEqual(self.seen, [{'group:cats'}])
+        self.assertEqual(
+            list(Invalidation.objects.values_list('tag', flat=True)),
+            ['group:cats']
+        )
+
+    def test_remote_invalidations_applied_once(self):
+        """Сбросы других узлов применяются при опросе, свои — нет."""
+        set_tagged('author_page', 'автор', ['author:42'], 60)
+        publish('author:7')
+        Invalidation.objects.create(tag='author:42', node='другой')
+        self.assertEqual(get_tagged('author_page'), 'автор')
+        self.assertEqual(poll(force=True), 1)
+        self.assertIsNone(get_tagged('author_page'))
+        self.assertEqual(self.seen, [{'author:7'}, {'author:42'}])
+        self.assertEqual(poll(force=True), 0)
+
+    def test_batch_publishes_once(self):
+        """Внутри пакета сбросы копятся и публикуются одним разом."""
+        with invalidation_batch():
+            publish('post:1', 'posts')
+            with invalidation_batch():
+                publish('post:2', 'posts')
+            self.assertEqual(self.seen, [])
+        self.assertEqual(self.seen, [{'post:1', 'post:2', 'posts'}])
+        self.assertEqual(Invalidation.objects.count(), 3)
+
+    def test_reapplied_after_commit(self):
+        """В транзакции теги сбрасываются ещё раз после коммита."""
+        callbacks = []
+        with mock.patch('core.invalidation.transaction.on_commit',
+                        callbacks.append):
+            publish('posts')
+        self.assertEqual(self.seen, [{'posts'}])
+        # Страница, собранная до коммита, под новыми метками.
+        set_tagged('index', 'старая лента', ['posts'], 60)
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(get_tagged('index'))
+
+    @override_settings(INVALIDATION_POLL_INTERVAL=None)
+    def test_single_node_writes_no_journal(self):
+        """Без опроса журнал не пишется: читать его некому."""
+        publish('posts')
+        self.assertEqual(self.seen, [{'posts'}])
+        self.assertFalse(Invalidation.objects.exists())
+
+    def test_publish_prunes_journal(self):
+        """Журнал чистится и у процессов, которые только пишут."""
+        Invalidation.objects.create(tag='old', node='другой')
+        Invalidation.objects.update(
+            created=timezone.now() - invalidation.RETENTION * 2
+        )
+        invalidation._state['pruned_at'] = -invalidation.PRUNE_INTERVAL
+        publish('posts')
+        self.assertEqual(
+            list(Invalidation.objects.values_list('tag', flat=True)),
+            ['posts']
+        )
+
+    def test_middleware_polls(self):
+        """Запрос сначала подтягивает сбросы с других узлов."""
+        Invalidation.objects.create(tag='pages', node='другой')
+        with override_settings(INVALIDATION_POLL_INTERVAL=0):
+            Client().get(reverse('about:tech'))
+        self.assertEqual(self.seen, [{'pages'}])
+
+
+class StampedeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        time.sleep(0.05)
+        return f'сборка {self.builds}'
+
+    def test_concurrent_misses_build_once(self):
+        """Одновременные промахи по ключу строят значение один раз."""
+        barrier = threading.Barrier(8)
+        results = []
+
+        def request():
+            barrier.wait()
+            results.append(cached_call('feed', self.build, 60))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(results, ['сборка 1'] * 8)
+
+    def test_stale_served_while_other_rebuilds(self):
+        """Пока ключ строит другой узел, отдаётся прежнее значение."""
+        cached_call('feed', self.build, 60)
+        cache.set('feed', ('старое', {}, time.time() - 1, 0.05), 60)
+        cache.add(LEASE_PREFIX + 'feed', True)
+        self.assertEqual(cached_call('feed', self.build, 60), 'старое')
+        self.assertEqual(self.builds, 1)
+        cache.delete(LEASE_PREFIX + 'feed')
+        self.assertEqual(cached_call('feed', self.build, 60), 'сборка 2')
+
+    def test_invalidated_value_rebuilt(self):
+        """Сброс тега перестраивает значение."""
+        cached_call('feed', self.build, 60, tags=['group:cats'])
+        self.assertEqual(
+            cached_call('feed', self.build, 60, tags=['group:cats']),
+            'сборка 1'
+        )
+        cache.delete('tag:group:cats')
+        self.assertEqual(
+            cached_call('feed', self.build, 60, tags=['group:cats']),
+            'сборка 2'
+        )
+
+    def test_nested_calls_share_stripe(self):
+        """Вложенная сборка в той же полосе не ждёт саму себя."""
+        with mock.patch.object(stampede, '_locks', [threading.RLock()]):
+            started = time.monotonic()
+            value = cached_call(
+                'page', lambda: cached_call('group', self.build, 60), 60
+            )
+            with single_flight('page') as outer:
+                with single_flight('page') as inner:
+                    self.assertTrue(outer and inner)
+            self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(value, 'сборка 1')
+
+    def test_lease_wait_does_not_block_stripe(self):
+        """Ожидание чужой аренды не держит полосу для других ключей."""
+        cache.add(LEASE_PREFIX + 'busy', True)
+        with mock.patch.object(stampede, '_locks', [threading.RLock()]):
+            waiter = threading.Thread(
+                target=lambda: cached_call('busy', self.build, 60)
+            )
+            waiter.start()
+            time.sleep(0.1)
+            started = time.monotonic()
+            cached_call('free', self.build, 60)
+            self.assertLess(time.monotonic() - started, 1)
+            cache.delete(LEASE_PREFIX + 'busy')
+            waiter.join()
+
+    def test_early_refresh(self):
+        """Долгая сборка обновляется заранее, до истечения срока."""
+        cached_call('feed', self.build, 60)
+        cached_call('feed', self.build, 60, beta=10 ** 6)
+        self.assertEqual(self.builds, 2)
+
+
+class StartupTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        """Разбор вывода -X importtime: модуль, своё и общее время."""
+        stderr = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     sorl.thumbnail\n'
+            'import time:       300 |        420 |   sorl\n'
+            'прочий вывод\n'
+        )
+        self.assertEqual(parse_importtime(stderr), [
+            ('sorl.thumbnail', 120, 120), ('sorl', 300, 420),
+        ])
+
+    def test_node_renewed_after_fork(self):
+        """Воркер после fork получает свой id узла шины сбросов."""
+        node = invalidation.NODE
+        try:
+            invalidation._after_fork()
+            self.assertNotEqual(invalidation.NODE, node)
+        finally:
+            invalidation.NODE = node
@@ -0,0 +1,30 @@
+import os
+
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+
+def warm_templates():
+    """Загружает все шаблоны проекта, чтобы заполнить cached.Loader.
+
+    Вызывается при старте воркера: первый запрос не платит за чтение
+    и разбор шаблонов. Возвращает число загруженных шаблонов.
+    """
+    loaded = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        dirs = list(engine.engine.dirs)
+        dirs += list(get_app_template_dirs('templates'))
+        for root in dirs:
+            for path, _, files in os.walk(root):
+                for name in files:
+                    if not name.endswith('.html'):
+                        continue
+                    template_name = os.path.relpath(
+                        os.path.join(path, name), root
+                    ).replace(os.sep, '/')
+                    engine.get_template(template_name)
+                    loaded += 1
+    return loaded
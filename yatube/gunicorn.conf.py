@@ -0,0 +1,28 @@
+"""Настройки gunicorn: gunicorn -c gunicorn.conf.py yatube.wsgi
+
+Приложение загружается один раз в мастере (preload_app) и достаётся
+воркерам через fork: импорты, настройка Django и разобранные шаблоны
+не повторяются в каждом воркере и делят память copy-on-write. Всё,
+что держит соединения с базой или потоки, запускается после fork.
+"""
+import multiprocessing
+import os
+
+os.environ['YATUBE_PRELOAD'] = '1'
+os.environ.setdefault('DEBUG', '0')
+
+bind = os.getenv('BIND', '127.0.0.1:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2))
+preload_app = True
+max_requests = 2000
+max_requests_jitter = 200
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    from posts.warmup import warm_in_background
+
+    # Соединения, открытые мастером, воркерам делить нельзя.
+    connections.close_all()
+    warm_in_background()
@@ -6,6 +6,10 @@ import sys
 
 def main():
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    if sys.version_info < (3, 12):
+        # Django 2.2 импортирует distutils; без этого setuptools подменяет
+        # его своей копией и тянет pkg_resources: +0,1-0,2 с к старту.
+        os.environ.setdefault('SETUPTOOLS_USE_DISTUTILS', 'stdlib')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,8 +1,66 @@
+from django import forms
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.utils.functional import cached_property
 
+from . import bulk
+from .export import keyset_iterator, render_rows, EXPORTS
 from .models import Post
 from .models import Group
 
+# Ниже этой оценки точный COUNT(*) дёшев, а оценка по pk после
+# удалений может врать в разы и давать пустые страницы.
+EXACT_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, который не делает COUNT(*) по всей таблице.
+
+    Для нефильтрованного списка число строк оценивается: в PostgreSQL
+    по статистике pg_class, в остальных БД по максимальному pk.
+    Отфильтрованный список и небольшие таблицы (оценка меньше
+    EXACT_COUNT_THRESHOLD) считаются точно.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if queryset.query.where:
+            return queryset.count()
+        estimate = self._estimate(queryset)
+        if estimate < EXACT_COUNT_THRESHOLD:
+            return queryset.count()
+        return estimate
+
+    def _estimate(self, queryset):
+        model = queryset.model
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE relname = %s',
+                    [model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return int(row[0])
+        return model._default_manager.aggregate(
+            last=Max('pk')
+        )['last'] or 0
+
+
+class MoveToGroupForm(forms.Form):
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.only('pk', 'title'),
+        label='Группа',
+        empty_label=None,
+    )
+
 
 class PostAdmin(admin.ModelAdmin):
     list_display = (
@@ -11,12 +69,73 @@ class PostAdmin(admin.ModelAdmin):
         'pub_date',
         'author',
         'group',
+        'views',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('group',)
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
+    actions = ('delete_in_background', 'move_to_group', 'export_ndjson')
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Стандартное удаление — одна огромная транзакция с каскадом.
+        actions.pop('delete_selected', None)
+        return actions
+
+    def _scheduled(self, request, operation, chunks):
+        self.message_user(
+            request,
+            f'Операция {operation}: в очередь поставлено частей: {chunks}. '
+            f'Ход выполнения — в разделе «Задачи», поиск по {operation}.'
+        )
+
+    def delete_in_background(self, request, queryset):
+        self._scheduled(request, *bulk.schedule(bulk.delete_posts, queryset))
+    delete_in_background.short_description = 'Удалить в фоне, по частям'
+    delete_in_background.allowed_permissions = ('delete',)
+
+    def move_to_group(self, request, queryset):
+        if 'apply' in request.POST:
+            form = MoveToGroupForm(request.POST)
+            if form.is_valid():
+                self._scheduled(request, *bulk.schedule(
+                    bulk.move_posts, queryset, form.cleaned_data['group'].pk
+                ))
+                return None
+        else:
+            form = MoveToGroupForm()
+        return render(request, 'admin/posts/move_to_group.html', {
+            **self.admin_site.each_context(request),
+            'title': 'Перенос постов в группу',
+            'count': queryset.count(),
+            'form': form,
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across') == '1',
+        })
+    move_to_group.short_description = 'Перенести в группу (в фоне)'
+    move_to_group.allowed_permissions = ('change',)
+
+    def export_ndjson(self, request, queryset):
+        rows = keyset_iterator(queryset, EXPORTS['posts'][1])
+        response = StreamingHttpResponse(
+            render_rows('posts', rows), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = 'attachment; filename="posts.ndjson"'
+        return response
+    export_ndjson.short_description = 'Выгрузить в NDJSON'
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug')
+    search_fields = ('title', 'slug')
 
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
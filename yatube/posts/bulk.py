@@ -0,0 +1,72 @@
+import logging
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.jobs import enqueue_many
+from core.invalidation import invalidation_batch
+from core.page_cache import bump_page_version
+
+from .models import Post, Comment
+
+CHUNK_SIZE = 500
+COMMENT_BATCH_SIZE = 2000
+
+logger = logging.getLogger(__name__)
+
+
+def _id_chunks(queryset, chunk_size):
+    """Режет выбранные посты на списки id по ключу, без OFFSET."""
+    queryset = queryset.order_by('pk')
+    last_pk = 0
+    while True:
+        ids = list(
+            queryset.filter(pk__gt=last_pk)
+            .values_list('pk', flat=True)[:chunk_size]
+        )
+        if not ids:
+            return
+        last_pk = ids[-1]
+        yield ids
+
+
+def schedule(func, queryset, *args, chunk_size=CHUNK_SIZE):
+    """Ставит func(ids, *args, operation, chunk, total) по частям в очередь.
+
+    Возвращает (id операции, число частей).
+    """
+    chunks = list(_id_chunks(queryset, chunk_size))
+    operation = uuid.uuid4().hex[:12]
+    enqueue_many(func, [
+        (ids, *args, operation, number, len(chunks))
+        for number, ids in enumerate(chunks, start=1)
+    ])
+    return operation, len(chunks)
+
+
+def delete_posts(ids, operation, chunk, total):
+    """Удаляет часть постов: сначала комментарии пачками, потом посты."""
+    with invalidation_batch(), transaction.atomic():
+        comments = Comment.objects.filter(post_id__in=ids)
+        while True:
+            batch = list(
+                comments.values_list('pk', flat=True)[:COMMENT_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            Comment.objects.filter(pk__in=batch).delete()
+        deleted, _ = Post.objects.filter(pk__in=ids).delete()
+    logger.info('%s: удаление, часть %s/%s, постов %s',
+                operation, chunk, total, deleted)
+
+
+def move_posts(ids, group_id, operation, chunk, total):
+    """Переносит часть постов в группу одним UPDATE."""
+    moved = Post.objects.filter(pk__in=ids).update(
+        group_id=group_id, updated=timezone.now()
+    )
+    # update() не шлёт сигналы: сбрасываем кеш страниц явно.
+    bump_page_version()
+    logger.info('%s: перенос в группу %s, часть %s/%s, постов %s',
+                operation, group_id, chunk, total, moved)
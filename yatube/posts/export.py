@@ -0,0 +1,107 @@
+import csv
+import json
+
+from django.utils.dateparse import parse_date
+
+from .models import Post, Comment, Follow
+
+BATCH_SIZE = 2000
+
+
+def parse_day(value):
+    """Дата вида YYYY-MM-DD; ValueError для любой другой строки.
+
+    parse_date молча отдаёт None на «abc» и 2020/01/01, и фильтр
+    по дате пропал бы: выгрузилась бы вся таблица.
+    """
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f'Неверная дата: {value!r}')
+    return day
+
+
+EXPORTS = {
+    'posts': (
+        Post,
+        ('id', 'text', 'pub_date', 'author__username', 'group__slug'),
+        {'author': 'author__username', 'group': 'group__slug',
+         'date': 'pub_date'},
+    ),
+    'comments': (
+        Comment,
+        ('id', 'post_id', 'author__username', 'text', 'created'),
+        {'author': 'author__username', 'group': 'post__group__slug',
+         'date': 'created'},
+    ),
+    'follows': (
+        Follow,
+        ('id', 'user__username', 'author__username'),
+        {'author': 'author__username'},
+    ),
+}
+FORMATS = ('ndjson', 'csv')
+
+
+class Echo:
+    """Псевдо-файл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(kind, author=None, group=None, date_from=None,
+                date_to=None, batch_size=BATCH_SIZE):
+    """Отдаёт строки выгрузки словарями, постранично по ключу pk.
+
+    Вместо OFFSET каждая пачка запрашивается как pk > последний pk,
+    поэтому память и время на пачку не зависят от размера таблицы.
+    """
+    model, fields, lookups = EXPORTS[kind]
+    queryset = model.objects.all()
+    filters = (
+        ('author', '', author),
+        ('group', '', group),
+        ('date', '__date__gte', date_from),
+        ('date', '__date__lte', date_to),
+    )
+    for name, suffix, value in filters:
+        if value is not None and name in lookups:
+            queryset = queryset.filter(**{lookups[name] + suffix: value})
+    return keyset_iterator(queryset, fields, batch_size)
+
+
+def keyset_iterator(queryset, fields, batch_size=BATCH_SIZE):
+    """Обходит queryset пачками values() по возрастанию pk."""
+    queryset = queryset.order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).values('pk', *fields)[:batch_size]
+        )
+        if not batch:
+            return
+        last_pk = batch[-1]['pk']
+        for row in batch:
+            del row['pk']
+            yield row
+
+
+def _serialize(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def render_rows(kind, rows, fmt='ndjson'):
+    """Превращает строки выгрузки в поток текстовых фрагментов."""
+    if fmt == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORTS[kind][1])
+        for row in rows:
+            yield writer.writerow(_serialize(value) for value in row.values())
+        return
+    for row in rows:
+        yield json.dumps(
+            {key: _serialize(value) for key, value in row.items()},
+            ensure_ascii=False
+        ) + '\n'
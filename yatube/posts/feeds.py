@@ -0,0 +1,154 @@
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from core.stampede import cached_call
+
+from .models import Post, Group, User
+
+FEED_LIMIT = 20
+FEED_CACHE_TIMEOUT = 60 * 15
+
+
+class PostsFeed(Feed):
+    """Лента последних постов: общая, группы или автора.
+
+    Объектом ленты служит словарь с заголовком, ссылкой и фильтром
+    для Post; записи берутся узким запросом values() без моделей.
+    """
+
+    def get_object(self, request, slug=None, username=None):
+        if slug is not None:
+            group = get_object_or_404(Group, slug=slug)
+            return {
+                'title': f'Yatube: группа {group.title}',
+                'link': reverse('posts:group_list', args=[slug]),
+                'lookup': {'group': group},
+            }
+        if username is not None:
+            author = get_object_or_404(User, username=username)
+            return {
+                'title': f'Yatube: посты {author.username}',
+                'link': reverse('posts:profile', args=[username]),
+                'lookup': {'author': author},
+            }
+        return {
+            'title': 'Yatube: последние обновления',
+            'link': reverse('posts:index'),
+            'lookup': {},
+        }
+
+    def title(self, obj):
+        return obj['title']
+
+    def link(self, obj):
+        return obj['link']
+
+    def description(self, obj):
+        return obj['title']
+
+    def items(self, obj):
+        return Post.objects.filter(**obj['lookup']).values(
+            'id', 'text', 'pub_date', 'author__username'
+        )[:FEED_LIMIT]
+
+    def item_title(self, item):
+        return item['text'][:50]
+
+    def item_description(self, item):
+        return item['text']
+
+    def item_link(self, item):
+        return reverse('posts:post_detail', args=[item['id']])
+
+    def item_pubdate(self, item):
+        return item['pub_date']
+
+    def item_author_name(self, item):
+        return item['author__username']
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+FEEDS = {
+    'rss': PostsFeed(),
+    'atom': AtomPostsFeed(),
+}
+
+
+def _feed_lookup(slug=None, username=None):
+    if slug is not None:
+        return {'group__slug': slug}
+    if username is not None:
+        return {'author__username': username}
+    return {}
+
+
+def feed_state(request, slug=None, username=None):
+    """(версия, время изменения) ленты; один запрос на запрос к ленте.
+
+    Версия складывается из последних pub_date и updated и числа
+    постов: удаление или правка любого поста тоже меняют её.
+    """
+    if not hasattr(request, '_feed_state'):
+        posts = Post.objects.filter(**_feed_lookup(slug, username))
+        state = posts.aggregate(
+            latest=Max('pub_date'), updated=Max('updated'), count=Count('pk')
+        )
+        stamps = [stamp for stamp in (state['latest'], state['updated'])
+                  if stamp is not None]
+        changed = max(stamps) if stamps else None
+        version = (
+            f'{changed.timestamp() if changed else 0}:{state["count"]}'
+        )
+        request._feed_state = version, changed
+    return request._feed_state
+
+
+def last_modified(request, fmt, slug=None, username=None):
+    """Время изменения ленты для условного GET.
+
+    Удаление не оставляет даты в базе, поэтому учитывается и момент,
+    когда версия ленты впервые попалась этому кешу.
+    """
+    version, changed = feed_state(request, slug, username)
+    key = f'feed_seen:{fmt}:{slug}:{username}:{version}'
+    cache.add(key, timezone.now(), FEED_CACHE_TIMEOUT)
+    seen = cache.get(key) or timezone.now()
+    return max(changed, seen) if changed else seen
+
+
+def etag(request, fmt, slug=None, username=None):
+    return f'{fmt}:{feed_state(request, slug, username)[0]}'
+
+
+@condition(etag_func=etag, last_modified_func=last_modified)
+def feed(request, fmt, slug=None, username=None):
+    """Отдаёт ленту из кеша, ключ которого — версия ленты.
+
+    Новый, изменённый или удалённый пост меняет версию и тем самым
+    ключ, поэтому инвалидация не нужна; повторные запросы с
+    If-None-Match или If-Modified-Since получают 304. Новый ключ
+    строит один запрос, а не все сразу.
+    """
+    if fmt not in FEEDS:
+        raise Http404
+    version, _ = feed_state(request, slug, username)
+
+    def build():
+        response = FEEDS[fmt](request, slug=slug, username=username)
+        return response.content, response['Content-Type']
+
+    content, content_type = cached_call(
+        f'feed:{fmt}:{slug}:{username}:{version}', build, FEED_CACHE_TIMEOUT
+    )
+    return HttpResponse(content, content_type=content_type)
@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404
+from django.utils import timezone
+
+from core.invalidation import subscribe
+from core.page_cache import PAGES_TAG
+from core.stampede import cached_call
+
+from .models import Post, Group
+
+POSTS_PER_PAGE = 10
+# Теги сброса кеша: любые посты и любые группы, см. core.invalidation.
+POSTS_TAG = 'posts'
+GROUPS_TAG = 'groups'
+REGISTRY_KEY = 'groups:registry'
+HOT_KEY = 'groups:hot'
+HOT_GROUPS = 10
+HOT_WINDOW = timedelta(days=7)
+HOT_TIMEOUT = 60 * 5
+FIRST_PAGE_TIMEOUT = 60 * 60
+
+
+def group_registry():
+    """Все группы по slug; загружаются одним запросом и живут в кеше.
+
+    Групп немного и меняются они только из админки, поэтому вместо
+    запроса на каждую страницу группы — один словарь на все процессы.
+    """
+    registry = cache.get(REGISTRY_KEY)
+    if registry is None:
+        registry = {group.slug: group for group in Group.objects.all()}
+        cache.set(REGISTRY_KEY, registry, None)
+    return registry
+
+
+def slug_by_id(group_id):
+    for group in group_registry().values():
+        if group.pk == group_id:
+            return group.slug
+    return None
+
+
+def get_group(slug):
+    try:
+        return group_registry()[slug]
+    except KeyError:
+        raise Http404('Группа не найдена')
+
+
+def hot_groups():
+    """Slug самых активных групп за последние HOT_WINDOW."""
+    slugs = cache.get(HOT_KEY)
+    if slugs is None:
+        slugs = list(
+            Post.objects.filter(
+                pub_date__gte=timezone.now() - HOT_WINDOW,
+                group__isnull=False,
+            ).values_list('group__slug', flat=True)
+            .annotate(posts=Count('pk'))
+            .order_by('-posts')[:HOT_GROUPS]
+        )
+        cache.set(HOT_KEY, slugs, HOT_TIMEOUT)
+    return slugs
+
+
+def _first_page_key(slug):
+    return f'groups:first_page:{slug}'
+
+
+def _build_first_page(group):
+    posts = group.posts_group.select_related('author', 'group')
+    return list(posts[:POSTS_PER_PAGE]), posts.count()
+
+
+def ensure_first_page(slug):
+    group = group_registry().get(slug)
+    if group is not None:
+        first_page(group)
+
+
+def first_page(group):
+    """Готовая первая страница горячей группы или None.
+
+    Страница собирается из кеша без запросов к ленте: счётчик
+    подставляется в Paginator, чтобы не было COUNT. После сброса
+    её перестраивает один запрос, остальные ждут его результата.
+    """
+    if group.slug not in hot_groups():
+        return None
+    posts, count = cached_call(
+        _first_page_key(group.slug),
+        lambda: _build_first_page(group),
+        FIRST_PAGE_TIMEOUT,
+    )
+    paginator = Paginator(
+        group.posts_group.select_related('author', 'group'), POSTS_PER_PAGE
+    )
+    paginator.count = count
+    return Page(posts, 1, paginator)
+
+
+def invalidate_first_pages(slugs=None):
+    """Сбрасывает первые страницы горячих групп после записи постов.
+
+    Без slugs сбрасываются все горячие страницы. Названные группы
+    пересчитываются сразу после коммита; пачка записей в одной
+    транзакции пересчитает их один раз: следующие вызовы найдут
+    страницу уже в кеше.
+    """
+    hot = hot_groups()
+    if slugs is None:
+        cache.delete_many([_first_page_key(slug) for slug in hot])
+        return
+    slugs = [slug for slug in slugs if slug in hot]
+    cache.delete_many([_first_page_key(slug) for slug in slugs])
+    for slug in slugs:
+        transaction.on_commit(lambda slug=slug: ensure_first_page(slug))
+
+
+def invalidate_registry():
+    invalidate_first_pages()
+    cache.delete_many([REGISTRY_KEY, HOT_KEY])
+
+
+@subscribe
+def evict(tags):
+    """Чистит реестр и страницы групп по сбросам с любого узла."""
+    if PAGES_TAG in tags or GROUPS_TAG in tags:
+        invalidate_registry()
+        return
+    slugs = [tag[len('group:'):] for tag in tags if tag.startswith('group:')]
+    if slugs:
+        invalidate_first_pages(slugs)
@@ -0,0 +1,164 @@
+import json
+
+from django.db import transaction
+
+from core.invalidation import publish
+
+from .forms import PostForm, CommentForm
+from .groups import POSTS_TAG
+from .models import Post, Comment, Group, User
+
+CHUNK_SIZE = 1000
+# id в базе — 64-битное целое со знаком.
+MAX_ID = 2 ** 63 - 1
+
+
+class Ingestor:
+    """Пакетная загрузка постов и комментариев из NDJSON.
+
+    Каждая строка — объект вида
+    {"type": "post", "author": "<username>", "text": "...",
+     "group": "<slug>"}
+    или {"type": "comment", "author": "<username>", "post": <id>,
+    "text": "..."}.
+    Записи проверяются формами PostForm/CommentForm и сохраняются
+    через bulk_create пачками по chunk_size, каждая пачка в своей транзакции.
+    bulk_create не шлёт сигналов, поэтому кеши затронутых страниц
+    сбрасываются одной публикацией на пачку.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.created = {'post': 0, 'comment': 0}
+        self.errors = []
+        self._users = {}
+        self._groups = dict(Group.objects.values_list('slug', 'pk'))
+
+    def run(self, lines):
+        chunk = []
+        for lineno, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append((lineno, line))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        if chunk:
+            self._flush(chunk)
+        return self.created, self.errors
+
+    def _user_id(self, username):
+        if username not in self._users:
+            self._users[username] = User.objects.filter(
+                username=username
+            ).values_list('pk', flat=True).first()
+        return self._users[username]
+
+    def _flush(self, chunk):
+        posts, comments = [], []
+        for lineno, line in chunk:
+            try:
+                item = json.loads(line)
+            except ValueError as error:
+                self.errors.append((lineno, f'невалидный JSON: {error}'))
+                continue
+            if not isinstance(item, dict):
+                self.errors.append((lineno, 'ожидался JSON-объект'))
+                continue
+            kind = item.get('type')
+            if kind == 'post':
+                obj = self._build_post(lineno, item)
+                target = posts
+            elif kind == 'comment':
+                obj = self._build_comment(lineno, item)
+                target = comments
+            else:
+                self.errors.append((lineno, f'неизвестный тип: {kind!r}'))
+                continue
+            if obj is not None:
+                target.append((lineno, obj))
+        self._check_comment_posts(comments)
+        with transaction.atomic():
+            Post.objects.bulk_create([obj for _, obj in posts])
+            Comment.objects.bulk_create(
+                [obj for _, obj in comments if obj.post_id is not None]
+            )
+        self.created['post'] += len(posts)
+        self.created['comment'] += sum(
+            1 for _, obj in comments if obj.post_id is not None
+        )
+        self._invalidate(
+            [obj for _, obj in posts],
+            [obj for _, obj in comments if obj.post_id is not None],
+        )
+
+    def _invalidate(self, posts, comments):
+        slugs = {pk: slug for slug, pk in self._groups.items()}
+        tags = {f'post:{obj.post_id}' for obj in comments}
+        if posts:
+            tags.add(POSTS_TAG)
+        for post in posts:
+            tags.add(f'author:{post.author_id}')
+            if post.group_id:
+                tags.add(f'group:{slugs[post.group_id]}')
+        publish(*tags)
+
+    def _build_common(self, lineno, item, form_class):
+        if not isinstance(item.get('author'), str):
+            self.errors.append((lineno, 'поле author должно быть строкой'))
+            return None
+        if not isinstance(item.get('text'), str):
+            self.errors.append((lineno, 'поле text должно быть строкой'))
+            return None
+        author_id = self._user_id(item.get('author'))
+        if author_id is None:
+            self.errors.append(
+                (lineno, f'автор не найден: {item.get("author")!r}')
+            )
+            return None
+        form = form_class({'text': item.get('text')})
+        if not form.is_valid():
+            self.errors.append((lineno, form.errors.as_text()))
+            return None
+        obj = form.save(commit=False)
+        obj.author_id = author_id
+        return obj
+
+    def _build_post(self, lineno, item):
+        slug = item.get('group')
+        if slug is not None and not isinstance(slug, str):
+            self.errors.append((lineno, 'поле group должно быть строкой'))
+            return None
+        if slug and slug not in self._groups:
+            self.errors.append((lineno, f'группа не найдена: {slug!r}'))
+            return None
+        post = self._build_common(lineno, item, PostForm)
+        if post is not None:
+            post.group_id = self._groups.get(slug)
+        return post
+
+    def _build_comment(self, lineno, item):
+        post_id = item.get('post')
+        # bool — подкласс int, но true/false не id поста.
+        if (not isinstance(post_id, int) or isinstance(post_id, bool)
+                or not 0 < post_id <= MAX_ID):
+            self.errors.append((lineno, 'поле post должно быть id поста'))
+            return None
+        comment = self._build_common(lineno, item, CommentForm)
+        if comment is not None:
+            comment.post_id = post_id
+        return comment
+
+    def _check_comment_posts(self, comments):
+        """Один запрос на пачку вместо get_object_or_404 на комментарий."""
+        ids = {obj.post_id for _, obj in comments}
+        existing = set(
+            Post.objects.filter(pk__in=ids).values_list('pk', flat=True)
+        )
+        for lineno, obj in comments:
+            if obj.post_id not in existing:
+                self.errors.append(
+                    (lineno, f'пост не найден: {obj.post_id!r}')
+                )
+                obj.post_id = None
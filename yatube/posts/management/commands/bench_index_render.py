@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import Engine, RequestContext
+from django.template.backends.django import get_installed_libraries
+from django.test import RequestFactory
+
+from posts.models import Post
+from posts.views import get_page_context_paginator
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает время рендера index без и с cached.Loader'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def make_engine(self, loaders):
+        options = settings.TEMPLATES[0]['OPTIONS']
+        return Engine(
+            dirs=settings.TEMPLATES[0]['DIRS'],
+            context_processors=options['context_processors'],
+            loaders=loaders,
+            libraries=get_installed_libraries(),
+        )
+
+    def bench(self, engine, request, context, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            # {% cache %} в index.html иначе спрятал бы стоимость рендера
+            cache.clear()
+            template = engine.get_template('posts/index.html')
+            template.render(RequestContext(request, context))
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        page_obj = get_page_context_paginator(
+            Post.objects.select_related('author', 'group'), request
+        )
+        page_obj.object_list = list(page_obj.object_list)
+        context = {'page_obj': page_obj}
+        engines = {
+            'без кеша': self.make_engine(LOADERS),
+            'cached.Loader': self.make_engine(
+                [('django.template.loaders.cached.Loader', LOADERS)]
+            ),
+        }
+        self.stdout.write(f'Постов на странице: {len(page_obj)}')
+        for label, engine in engines.items():
+            elapsed = self.bench(engine, request, context, options['repeat'])
+            self.stdout.write(f'{label}: {elapsed:.2f} мс на страницу')
@@ -0,0 +1,79 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F
+from django.test import Client
+
+from posts.counters import view_counter
+from posts.models import Post
+
+User = get_user_model()
+
+
+def naive_record(post_id):
+    Post.objects.filter(pk=post_id).update(views=F('views') + 1)
+
+
+MODES = {
+    'без подсчёта': lambda post_id: None,
+    'UPDATE на запрос': naive_record,
+    'буфер': view_counter.record,
+}
+
+
+class Command(BaseCommand):
+    help = 'Пропускная способность post_detail при разных способах подсчёта'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=4)
+
+    def read(self, urls):
+        client = Client()
+        try:
+            for url in urls:
+                client.get(url)
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        # Свои посты замер создаёт в тестовой базе, а не в рабочей:
+        # иначе они попали бы в ленту, карты сайта и RSS.
+        name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            self.bench(options)
+        finally:
+            connection.creation.destroy_test_db(name, verbosity=0)
+
+    def bench(self, options):
+        author = User.objects.create(username='bench_views')
+        posts = [
+            Post.objects.create(author=author, text=f'пост {i}')
+            for i in range(20)
+        ]
+        urls = [f'/posts/{posts[i % len(posts)].pk}/'
+                for i in range(options['requests'])]
+        threads = options['threads']
+        for label, record in MODES.items():
+            cache.clear()
+            # Прогрев тоже в потоке: соединение основного потока держит
+            # тестовую базу SQLite в памяти живой.
+            with ThreadPoolExecutor(1) as pool:
+                pool.submit(self.read, urls[:len(posts)]).result()
+            with mock.patch.object(view_counter, 'record', record):
+                started = time.perf_counter()
+                with ThreadPoolExecutor(threads) as pool:
+                    list(pool.map(self.read, [
+                        urls[i::threads] for i in range(threads)
+                    ]))
+                elapsed = time.perf_counter() - started
+            view_counter.flush()
+            self.stdout.write(
+                f'{label:18} {len(urls) / elapsed:8.0f} запросов/с'
+            )
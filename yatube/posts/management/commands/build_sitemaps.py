@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import SITEMAP_LIMIT, build_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Генерирует sitemap.xml и файлы разделов в SITEMAP_ROOT'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default=settings.SITEMAP_BASE_URL)
+        parser.add_argument('--limit', type=int, default=SITEMAP_LIMIT)
+
+    def handle(self, *args, **options):
+        names = build_sitemaps(
+            settings.SITEMAP_ROOT,
+            options['base_url'],
+            limit=options['limit'],
+        )
+        self.stdout.write(f'Записано файлов: {len(names)}')
@@ -0,0 +1,38 @@
+import argparse
+
+from django.core.management.base import BaseCommand
+
+from posts.export import EXPORTS, FORMATS, BATCH_SIZE
+from posts.export import export_rows, parse_day, render_rows
+
+
+def date_argument(value):
+    try:
+        return parse_day(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка постов, комментариев и подписок'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=tuple(EXPORTS))
+        parser.add_argument('--format', choices=FORMATS, default='ndjson')
+        parser.add_argument('--author', help='username автора')
+        parser.add_argument('--group', help='slug группы')
+        parser.add_argument('--date-from', type=date_argument)
+        parser.add_argument('--date-to', type=date_argument)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            options['kind'],
+            author=options['author'],
+            group=options['group'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+            batch_size=options['batch_size'],
+        )
+        for chunk in render_rows(options['kind'], rows, options['format']):
+            self.stdout.write(chunk, ending='')
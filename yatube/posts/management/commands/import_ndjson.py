@@ -0,0 +1,28 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from posts.ingest import Ingestor, CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Пакетная загрузка постов и комментариев из NDJSON-файла'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='путь к файлу или - для stdin')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        ingestor = Ingestor(chunk_size=options['chunk_size'])
+        if options['path'] == '-':
+            created, errors = ingestor.run(sys.stdin)
+        else:
+            with open(options['path'], encoding='utf-8') as lines:
+                created, errors = ingestor.run(lines)
+        for lineno, message in errors:
+            self.stderr.write(f'строка {lineno}: {message}')
+        self.stdout.write(
+            f'Постов: {created["post"]}, '
+            f'комментариев: {created["comment"]}, '
+            f'ошибок: {len(errors)}'
+        )
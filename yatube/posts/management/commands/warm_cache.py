@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.warmup import warm, warm_paths
+
+
+class Command(BaseCommand):
+    help = ('Прогревает кеш страниц: ленту, горячие группы и авторов. '
+            'Имеет смысл с общим кешем (Redis, memcached): LocMemCache '
+            'у каждого процесса свой, его воркеры прогревают сами.')
+
+    def add_arguments(self, parser):
+        options = settings.CACHE_WARMUP
+        parser.add_argument('--pages', type=int, default=options['pages'])
+        parser.add_argument('--groups', type=int, default=options['groups'])
+        parser.add_argument(
+            '--profiles', type=int, default=options['profiles']
+        )
+        parser.add_argument(
+            '--threads', type=int, default=options['threads']
+        )
+
+    def handle(self, *args, **options):
+        paths = warm_paths(
+            options['pages'], options['groups'], options['profiles']
+        )
+        elapsed, hit_rate = warm(paths, options['threads'])
+        self.stdout.write(
+            f'Прогрето страниц: {len(paths)} за {elapsed:.2f} с, '
+            f'в кеше сразу после прогрева: {hit_rate:.0%}'
+        )
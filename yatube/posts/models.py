@@ -20,7 +20,12 @@ class Post(models.Model):
     )
     pub_date = models.DateTimeField(
         'Дата публикации',
-        auto_now_add=True
+        auto_now_add=True,
+        db_index=True
+    )
+    updated = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
     )
     author = models.ForeignKey(
         User,
@@ -42,6 +47,11 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    views = models.PositiveIntegerField(
+        'Просмотры',
+        default=0,
+        editable=False
+    )
 
     def __str__(self):
         return self.text[:15]
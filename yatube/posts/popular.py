@@ -0,0 +1,105 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.stampede import single_flight
+
+SCORES_KEY = 'popular:scores'
+TOP_K = 100
+CAPACITY = TOP_K * 4
+HALF_LIFE = 60 * 60 * 6
+VIEW_WEIGHT = 1
+COMMENT_WEIGHT = 5
+
+_lock = threading.Lock()
+_pending = {}
+_state = {'merged_at': time.monotonic()}
+
+
+def _log_weight(weight, now):
+    """Вес события в log2-шкале, приведённый к общему началу отсчёта.
+
+    Вместо того чтобы уменьшать все оценки со временем, новые события
+    получают вес 2 ** (now / HALF_LIFE): порядок постов тот же, что при
+    честном затухании, а старые оценки не нужно пересчитывать.
+    """
+    return math.log2(weight) + now / HALF_LIFE
+
+
+def _log_add(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def record_event(post_id, weight, now=None):
+    """Копит вес события в буфере процесса.
+
+    В общий словарь оценок буфер сливается merge() не чаще раза в
+    POPULAR_MERGE_INTERVAL секунд: просмотр поста — это сложение
+    в словаре, а не чтение и запись всех оценок через кеш.
+    """
+    value = _log_weight(weight, time.time() if now is None else now)
+    with _lock:
+        if post_id in _pending:
+            value = _log_add(_pending[post_id], value)
+        _pending[post_id] = value
+        due = (time.monotonic() - _state['merged_at']
+               >= settings.POPULAR_MERGE_INTERVAL)
+    if due:
+        merge()
+
+
+def merge():
+    """Сливает буфер процесса в общий top-K; возвращает число постов.
+
+    Оценки лежат одним словарём не больше CAPACITY постов. Новый пост
+    при заполненном словаре вытесняет самый слабый и наследует его
+    оценку (Space-Saving): рейтинг приближённый, но верхушка устойчива
+    и память не растёт с числом постов. Сливает один процесс за раз
+    (аренда в кеше); если словарь занят, буфер ждёт следующего раза.
+    Общим рейтинг делает только общий для воркеров кеш: с LocMemCache
+    каждый воркер считает свои просмотры.
+    """
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _state['merged_at'] = time.monotonic()
+    if not pending:
+        return 0
+    with single_flight(SCORES_KEY, blocking=False) as leader:
+        if not leader:
+            with _lock:
+                for post_id, value in pending.items():
+                    if post_id in _pending:
+                        value = _log_add(_pending[post_id], value)
+                    _pending[post_id] = value
+            return 0
+        scores = cache.get(SCORES_KEY) or {}
+        for post_id, value in pending.items():
+            if post_id in scores:
+                scores[post_id] = _log_add(scores[post_id], value)
+                continue
+            if len(scores) >= CAPACITY:
+                weakest = min(scores, key=scores.get)
+                value = _log_add(scores.pop(weakest), value)
+            scores[post_id] = value
+        cache.set(SCORES_KEY, scores, None)
+    return len(pending)
+
+
+def forget(post_id):
+    with _lock:
+        _pending.pop(post_id, None)
+    with single_flight(SCORES_KEY):
+        scores = cache.get(SCORES_KEY) or {}
+        if scores.pop(post_id, None) is not None:
+            cache.set(SCORES_KEY, scores, None)
+
+
+def top_posts(limit=TOP_K):
+    """id самых популярных постов по убыванию оценки."""
+    scores = cache.get(SCORES_KEY) or {}
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
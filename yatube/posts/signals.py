@@ -0,0 +1,66 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.invalidation import publish
+from core.page_cache import PAGES_TAG
+
+from . import popular
+from .groups import GROUPS_TAG, POSTS_TAG, slug_by_id
+from .models import Post, Group, Comment, Follow, User
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_group(sender, instance, raw=False, **kwargs):
+    # Пост могли перенести: страница прежней группы тоже устареет.
+    if instance.pk and not raw:
+        instance._old_group_id = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('group_id', flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    group_ids = {instance.group_id, getattr(instance, '_old_group_id', None)}
+    slugs = {slug_by_id(group_id) for group_id in group_ids if group_id}
+    publish(
+        POSTS_TAG,
+        f'post:{instance.pk}',
+        f'author:{instance.author_id}',
+        *(f'group:{slug}' for slug in slugs if slug),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    publish(f'post:{instance.post_id}')
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow(sender, instance, **kwargs):
+    publish(f'author:{instance.author_id}', f'follows:{instance.user_id}')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group(sender, **kwargs):
+    # Название группы есть во фрагментах постов на всех лентах.
+    publish(PAGES_TAG, GROUPS_TAG)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, instance, created=False,
+                            update_fields=None, **kwargs):
+    # У нового пользователя ещё нет страниц, а вход сохраняет только
+    # last_login. Имя автора в лентах обновится с таймаутом страниц:
+    # сбрасывать ради него весь кеш на каждом узле слишком дорого.
+    if created or update_fields and set(update_fields) <= {'last_login'}:
+        return
+    publish(f'author:{instance.pk}')
+
+
+@receiver(post_delete, sender=Post)
+def forget_popularity(sender, instance, **kwargs):
+    popular.forget(instance.pk)
@@ -0,0 +1,109 @@
+import glob
+import os
+import tempfile
+from contextlib import contextmanager
+from xml.sax.saxutils import escape
+
+from django.urls import reverse
+
+from .export import keyset_iterator
+from .models import Post, Group, User
+
+SITEMAP_LIMIT = 50000
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def post_urls():
+    for row in keyset_iterator(Post.objects.all(), ('id', 'pub_date')):
+        yield (
+            reverse('posts:post_detail', args=[row['id']]),
+            row['pub_date'],
+        )
+
+
+def group_urls():
+    for row in keyset_iterator(Group.objects.all(), ('slug',)):
+        yield reverse('posts:group_list', args=[row['slug']]), None
+
+
+def profile_urls():
+    authors = User.objects.filter(posts__isnull=False).distinct()
+    for row in keyset_iterator(authors, ('username',)):
+        yield reverse('posts:profile', args=[row['username']]), None
+
+
+SECTIONS = {
+    'posts': post_urls,
+    'groups': group_urls,
+    'profiles': profile_urls,
+}
+
+
+def _url_entry(base_url, path, lastmod):
+    entry = f'<url><loc>{escape(base_url + path)}</loc>'
+    if lastmod is not None:
+        entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+    return entry + '</url>\n'
+
+
+@contextmanager
+def _replace(root, name):
+    """Пишет файл рядом под временным именем и подменяет целиком.
+
+    Робот, пришедший во время сборки, получит прежний файл или новый,
+    но не недописанный.
+    """
+    file = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=root, suffix='.tmp', delete=False
+    )
+    try:
+        with file:
+            yield file
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, os.path.join(root, name))
+    except BaseException:
+        os.unlink(file.name)
+        raise
+
+
+def _write_chunk(root, name, entries):
+    with _replace(root, name) as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        file.write(f'<urlset xmlns="{XMLNS}">\n')
+        file.writelines(entries)
+        file.write('</urlset>\n')
+
+
+def build_sitemaps(root, base_url, limit=SITEMAP_LIMIT):
+    """Пишет sitemap.xml и файлы разделов не больше limit URL каждый.
+
+    Адреса читаются пачками по ключу, в памяти держится только
+    текущий файл. Файлы подменяются целиком, разделы от прежней,
+    более длинной сборки удаляются. Возвращает имена записанных
+    файлов разделов.
+    """
+    os.makedirs(root, exist_ok=True)
+    base_url = base_url.rstrip('/')
+    names = []
+    for section, urls in SECTIONS.items():
+        entries = []
+        for path, lastmod in urls():
+            entries.append(_url_entry(base_url, path, lastmod))
+            if len(entries) >= limit:
+                names.append(f'sitemap-{section}-{len(names) + 1}.xml')
+                _write_chunk(root, names[-1], entries)
+                entries = []
+        if entries:
+            names.append(f'sitemap-{section}-{len(names) + 1}.xml')
+            _write_chunk(root, names[-1], entries)
+    with _replace(root, 'sitemap.xml') as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        file.write(f'<sitemapindex xmlns="{XMLNS}">\n')
+        for name in names:
+            loc = escape(f'{base_url}/{name}')
+            file.write(f'<sitemap><loc>{loc}</loc></sitemap>\n')
+        file.write('</sitemapindex>\n')
+    for path in glob.glob(os.path.join(root, 'sitemap-*.xml')):
+        if os.path.basename(path) not in names:
+            os.remove(path)
+    return names
@@ -0,0 +1,62 @@
+from hashlib import md5
+
+from django import template
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+from core.reverse import fast_reverse
+
+register = template.Library()
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+POST_TEMPLATE = 'includes/posts.html'
+
+
+def fragment_key(post):
+    """Ключ фрагмента поста в общем кеше.
+
+    Версия — хеш всего, что попадает во фрагмент: дата изменения поста,
+    имя автора и slug группы. Правка поста, переименование автора или
+    смена группы дают новый ключ, старый фрагмент просто истекает.
+    """
+    group_slug = post.group.slug if post.group else ''
+    version = md5(
+        f'{post.updated.timestamp()}:{post.author.username}:'
+        f'{post.author.get_full_name()}:{group_slug}'.encode()
+    ).hexdigest()
+    return f'post_fragment:{post.pk}:{version}'
+
+
+def render_post(post, item_template=None):
+    item_template = item_template or get_template(POST_TEMPLATE)
+    return item_template.render({
+        'post': post,
+        'profile_url': fast_reverse('posts:profile', post.author.username),
+        'detail_url': fast_reverse('posts:post_detail', post.pk),
+        'group_url': post.group and fast_reverse(
+            'posts:group_list', post.group.slug
+        ),
+    })
+
+
+@register.simple_tag
+def posts(page):
+    """Рендерит всю страницу ленты за один проход.
+
+    Возвращает список готовых фрагментов для {% posts page_obj as items %}.
+    Фрагменты общие для всех лент и читаются одним get_many на страницу;
+    рендерятся и записываются одним set_many только недостающие.
+    """
+    page_posts = list(page)
+    keys = [fragment_key(post) for post in page_posts]
+    fragments = cache.get_many(keys)
+    missing = {}
+    item_template = get_template(POST_TEMPLATE)
+    for key, post in zip(keys, page_posts):
+        if key not in fragments:
+            missing[key] = render_post(post, item_template)
+    if missing:
+        cache.set_many(missing, FRAGMENT_TIMEOUT)
+        fragments.update(missing)
+    return [mark_safe(fragments[key]) for key in keys]
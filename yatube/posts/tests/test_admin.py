@@ -0,0 +1,155 @@
+import json
+import time
+from unittest import mock
+
+from django.test import TestCase, Client, override_settings
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.jobs import run_batch
+from core.models import Job
+
+from .. import bulk
+from ..models import Post, Group, Comment
+
+User = get_user_model()
+
+MAX_RENDER_SECONDS = 2
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=None)
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.groups = Group.objects.bulk_create([
+            Group(title=f'group{i}', slug=f'slug{i}', description='-')
+            for i in range(30)
+        ])
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def seed(self, count):
+        Post.objects.bulk_create([
+            Post(
+                author=self.admin,
+                text=f'Пост {i}',
+                group=self.groups[i % len(self.groups)],
+            )
+            for i in range(count)
+        ])
+
+    def changelist(self):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.client.get(reverse('admin:posts_post_changelist'))
+            elapsed = time.perf_counter() - started
+        self.assertEqual(response.status_code, 200)
+        return response, queries, elapsed
+
+    @mock.patch('posts.admin.EXACT_COUNT_THRESHOLD', 0)
+    def test_changelist_queries_bounded(self):
+        """Число запросов списка постов не растёт с числом строк."""
+        self.seed(5)
+        self.changelist()
+        _, few, _ = self.changelist()
+        self.seed(300)
+        response, many, elapsed = self.changelist()
+        self.assertEqual(len(few), len(many))
+        self.assertLess(elapsed, MAX_RENDER_SECONDS)
+        self.assertFalse(any(
+            'COUNT(*)' in query['sql'] and 'WHERE' not in query['sql']
+            for query in many.captured_queries
+        ))
+        self.assertEqual(len(response.context['cl'].result_list), 100)
+
+    def test_small_table_counted_exactly(self):
+        """После удалений оценка по pk не даёт пустых страниц."""
+        self.seed(300)
+        Post.objects.filter(
+            pk__in=list(Post.objects.values_list('pk', flat=True)[:250])
+        ).delete()
+        response, _, _ = self.changelist()
+        self.assertEqual(response.context['cl'].result_count, 50)
+        self.assertEqual(response.context['cl'].paginator.num_pages, 1)
+
+    def action(self, name, ids, **data):
+        return self.client.post(reverse('admin:posts_post_changelist'), {
+            'action': name,
+            helpers.ACTION_CHECKBOX_NAME: ids,
+            **data,
+        })
+
+    def test_bulk_delete_runs_in_chunks(self):
+        """Удаление идёт частями, каждая сбрасывает кеш одним пакетом."""
+        self.seed(7)
+        ids = sorted(Post.objects.values_list('pk', flat=True))
+        Comment.objects.bulk_create([
+            Comment(post_id=pk, author=self.admin, text='ком') for pk in ids
+        ])
+        response = self.action('delete_in_background', ids[:5])
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Job.objects.count(), 1)
+        Job.objects.all().delete()
+        bulk.schedule(bulk.delete_posts, Post.objects.filter(pk__in=ids[:5]),
+                      chunk_size=3)
+        self.assertEqual(Job.objects.count(), 2)
+        self.assertEqual(Post.objects.count(), 7)
+        with mock.patch('core.invalidation._apply') as apply:
+            run_batch()
+        self.assertEqual(apply.call_count, 2)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
+
+    def test_move_to_group(self):
+        """Перенос показывает промежуточную страницу и идёт в фоне."""
+        self.seed(4)
+        ids = sorted(Post.objects.values_list('pk', flat=True))
+        response = self.action('move_to_group', ids[:2])
+        self.assertContains(response, 'group29')
+        group = Group.objects.get(slug='slug0')
+        self.action('move_to_group', ids[1:3], apply='1', group=group.pk)
+        run_batch()
+        moved = Post.objects.filter(group=group).values_list('pk', flat=True)
+        self.assertEqual(sorted(moved), ids[1:3])
+
+    def test_move_to_group_validates_group(self):
+        """Без группы или с несуществующей форма показывается снова."""
+        self.seed(2)
+        ids = sorted(Post.objects.values_list('pk', flat=True))
+        for data in ({}, {'group': 0}):
+            with self.subTest(data=data):
+                response = self.action('move_to_group', ids, apply='1',
+                                       **data)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['form'].errors)
+        self.assertFalse(Job.objects.exists())
+
+    def test_operation_jobs_searchable(self):
+        """Части операции находятся в «Задачах» по её id."""
+        self.seed(2)
+        ids = sorted(Post.objects.values_list('pk', flat=True))
+        operation, _ = bulk.schedule(
+            bulk.delete_posts, Post.objects.filter(pk__in=ids)
+        )
+        response = self.client.get(
+            reverse('admin:core_job_changelist'), {'q': operation}
+        )
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+    def test_export_action_streams_selection(self):
+        """Выгрузка отдаёт только выбранные посты потоком NDJSON."""
+        self.seed(4)
+        ids = sorted(Post.objects.values_list('pk', flat=True))
+        response = self.action('export_ndjson', ids[1:3])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], ids[1:3])
@@ -40,10 +40,14 @@ class GroupCacheTests(TestCase):
         url = reverse('posts:index')
         response = self.guest_client.get(url)
         self.assertEqual(len(response.context['page_obj']), 1)
-        post = Post.objects.get(id=1)
-        post.delete()
+        # update() не шлёт сигналов: страница отдаётся из кеша.
+        Post.objects.filter(pk=self.post.pk).update(text='Новый текст')
         response = self.guest_client.get(url)
-        self. assertIn(post.text, response.content.decode())
+        self.assertIn(self.post.text, response.content.decode())
         cache.clear()
         response = self.guest_client.get(url)
-        self.assertNotIn(post.text, response.content.decode())
+        self.assertNotIn(self.post.text, response.content.decode())
+        # Удаление сбрасывает кеш сразу, без ожидания таймаута.
+        Post.objects.get(pk=self.post.pk).delete()
+        response = self.guest_client.get(url)
+        self.assertNotIn('Новый текст', response.content.decode())
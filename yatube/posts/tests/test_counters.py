@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.urls import reverse
+
+from ..counters import ViewCounter, view_counter
+from ..models import Post
+
+User = get_user_model()
+
+
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.first = Post.objects.create(author=cls.user, text='первый')
+        cls.second = Post.objects.create(author=cls.user, text='второй')
+
+    def setUp(self):
+        self.counter = ViewCounter(interval=60)
+
+    def views(self):
+        return dict(Post.objects.values_list('pk', 'views'))
+
+    def test_flush_is_one_update(self):
+        """Все накопленные просмотры пишутся одним запросом."""
+        for post in (self.first, self.second, self.first):
+            self.counter.record(post.pk)
+        self.assertEqual(self.views(), {self.first.pk: 0, self.second.pk: 0})
+        with self.assertNumQueries(1):
+            self.assertEqual(self.counter.flush(), 2)
+        self.assertEqual(self.views(), {self.first.pk: 2, self.second.pk: 1})
+        with self.assertNumQueries(0):
+            self.counter.flush()
+
+    def test_failed_flush_keeps_counts(self):
+        """Ошибка записи не теряет и не удваивает просмотры."""
+        self.counter.record(self.first.pk)
+        with mock.patch('posts.counters.Post.objects.filter',
+                        side_effect=DatabaseError):
+            with self.assertLogs('posts.counters', 'ERROR'):
+                with self.assertRaises(DatabaseError):
+                    self.counter.flush()
+        self.counter.record(self.first.pk)
+        self.counter.flush()
+        self.assertEqual(self.views()[self.first.pk], 2)
+
+    def test_flush_after_interval(self):
+        """Буфер сбрасывается сам, когда прошёл интервал."""
+        counter = ViewCounter(interval=0)
+        counter.record(self.second.pk)
+        self.assertEqual(self.views()[self.second.pk], 1)
+
+    def test_post_detail_counts_cached_views(self):
+        """Просмотр страницы из кеша тоже засчитывается."""
+        view_counter.flush()
+        client = Client()
+        url = reverse('posts:post_detail', args=[self.second.pk])
+        for _ in range(3):
+            client.get(url)
+        client.get(reverse('posts:post_detail', args=[0]))
+        self.assertEqual(view_counter.pending, {self.second.pk: 3})
+        view_counter.flush()
+        self.assertEqual(self.views()[self.second.pk], 3)
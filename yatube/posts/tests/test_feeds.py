@@ -0,0 +1,87 @@
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+from ..models import Post, Group
+
+User = get_user_model()
+
+
+class FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='group',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Пост в группе',
+            group=cls.group,
+        )
+        Post.objects.create(author=cls.user, text='Пост без группы')
+
+    def setUp(self):
+        self.guest_client = Client()
+        cache.clear()
+
+    def test_feeds_content(self):
+        """Ленты группы, автора и общая содержат нужные посты."""
+        urls = {
+            reverse('posts:feed', args=['rss']): 2,
+            reverse('posts:feed', args=['atom']): 2,
+            reverse('posts:group_feed', args=['slug', 'rss']): 1,
+            reverse('posts:profile_feed', args=['auth', 'atom']): 2,
+        }
+        for url, count in urls.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                content = response.content.decode()
+                self.assertEqual(
+                    content.count('<item>') + content.count('<entry>'),
+                    count
+                )
+
+    def test_unknown_feed_not_found(self):
+        """Несуществующая группа и формат ленты дают 404."""
+        for url in (
+            reverse('posts:group_feed', args=['nope', 'rss']),
+            reverse('posts:feed', args=['json']),
+        ):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_conditional_get(self):
+        """Повторный запрос с If-Modified-Since получает 304."""
+        url = reverse('posts:feed', args=['rss'])
+        response = self.guest_client.get(url)
+        response = self.guest_client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_delete_of_older_post_changes_feed(self):
+        """Удаление не самого нового поста меняет ленту и её версию."""
+        url = reverse('posts:feed', args=['rss'])
+        first = self.guest_client.get(url)
+        self.post.delete()
+        later = timezone.now() + timedelta(seconds=5)
+        with mock.patch('posts.feeds.timezone.now', return_value=later):
+            for headers in (
+                {'HTTP_IF_NONE_MATCH': first['ETag']},
+                {'HTTP_IF_MODIFIED_SINCE': first['Last-Modified']},
+            ):
+                with self.subTest(headers=headers):
+                    response = self.guest_client.get(url, **headers)
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    self.assertNotContains(response, 'Пост в группе')
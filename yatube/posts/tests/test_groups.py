@@ -0,0 +1,78 @@
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404
+from django.urls import reverse
+
+from ..groups import first_page, get_group, group_registry, hot_groups
+from ..models import Post, Group
+
+User = get_user_model()
+
+
+class GroupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.cats = Group.objects.create(
+            title='Коты', slug='cats', description='Про котов'
+        )
+        cls.dogs = Group.objects.create(
+            title='Собаки', slug='dogs', description='Про собак'
+        )
+        for i in range(12):
+            Post.objects.create(author=cls.user, text=f'кот {i}',
+                                group=cls.cats)
+        Post.objects.create(author=cls.user, text='пёс', group=cls.dogs)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_registry_loaded_once(self):
+        """Группы читаются одним запросом и дальше берутся из кеша."""
+        with self.assertNumQueries(1):
+            group_registry()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group('cats').title, 'Коты')
+            with self.assertRaises(Http404):
+                get_group('birds')
+
+    def test_registry_invalidated_on_group_change(self):
+        """Правка группы в админке сбрасывает реестр."""
+        group_registry()
+        group = Group.objects.get(slug='dogs')
+        group.title = 'Псы'
+        group.save()
+        self.assertEqual(get_group('dogs').title, 'Псы')
+        Group.objects.create(title='Птицы', slug='birds', description='-')
+        self.assertEqual(get_group('birds').title, 'Птицы')
+
+    def test_hot_group_first_page_precomputed(self):
+        """Первая страница горячей группы собирается без запросов."""
+        self.assertEqual(hot_groups(), ['cats', 'dogs'])
+        group = get_group('cats')
+        first_page(group)
+        with self.assertNumQueries(0):
+            page = first_page(group)
+            self.assertEqual(len(page), 10)
+            self.assertEqual(page.paginator.num_pages, 2)
+            self.assertTrue(page.has_next())
+        Post.objects.create(author=self.user, text='новый кот', group=group)
+        self.assertEqual(first_page(group)[0].text, 'новый кот')
+        self.assertEqual(first_page(group).paginator.count, 13)
+
+    def test_group_pages(self):
+        """Лента группы и каталог групп отдают верные данные."""
+        response = self.client.get(reverse('posts:group_list',
+                                           args=['cats']))
+        self.assertEqual(response.context['page_obj'][0].text, 'кот 11')
+        response = self.client.get(reverse('posts:group_list',
+                                           args=['birds']))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse('posts:group_index'))
+        groups = list(response.context['page_obj'])
+        self.assertEqual([group.slug for group in groups], ['cats', 'dogs'])
+        self.assertEqual(groups[0].post_count, 12)
+        self.assertIsNotNone(groups[1].last_activity)
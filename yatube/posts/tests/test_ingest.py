@@ -0,0 +1,63 @@
+import json
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+
+from ..ingest import Ingestor
+from ..models import Post, Group, Comment
+
+User = get_user_model()
+
+
+class IngestTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='group',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Тестовый пост')
+
+    def test_bulk_ingest(self):
+        """Посты и комментарии загружаются пачками, ошибки по строкам."""
+        lines = [
+            json.dumps({'type': 'post', 'author': 'auth',
+                        'text': 'пост', 'group': 'slug'}),
+            json.dumps({'type': 'comment', 'author': 'auth',
+                        'post': self.post.pk, 'text': 'коммент'}),
+            json.dumps({'type': 'comment', 'author': 'auth',
+                        'post': 999, 'text': 'коммент'}),
+            json.dumps({'type': 'post', 'author': 'nobody', 'text': 'x'}),
+            json.dumps({'type': 'post', 'author': 'auth', 'text': ''}),
+            'не json',
+        ] * 3
+        created, errors = Ingestor(chunk_size=4).run(lines)
+        self.assertEqual(created, {'post': 3, 'comment': 3})
+        self.assertEqual(
+            sorted(lineno for lineno, _ in errors),
+            [3, 4, 5, 6, 9, 10, 11, 12, 15, 16, 17, 18]
+        )
+        self.assertEqual(
+            Post.objects.filter(group=self.group, text='пост').count(), 3
+        )
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 3)
+
+    def test_wrong_field_types_are_line_errors(self):
+        """Неверные типы полей — ошибка строки, а не падение загрузки."""
+        lines = [
+            json.dumps({'type': 'post', 'author': ['auth'], 'text': 'x'}),
+            json.dumps({'type': 'post', 'author': 'auth', 'text': 'x',
+                        'group': ['slug']}),
+            json.dumps({'type': 'comment', 'author': 'auth',
+                        'post': True, 'text': 'x'}),
+            json.dumps({'type': 'comment', 'author': 'auth',
+                        'post': 10 ** 30, 'text': 'x'}),
+            json.dumps({'type': 'post', 'author': 'auth', 'text': {'a': 1}}),
+            json.dumps({'type': 'post', 'author': 'auth', 'text': 'ок'}),
+        ]
+        created, errors = Ingestor().run(lines)
+        self.assertEqual(created, {'post': 1, 'comment': 0})
+        self.assertEqual([lineno for lineno, _ in errors], [1, 2, 3, 4, 5])
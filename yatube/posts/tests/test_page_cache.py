@@ -0,0 +1,103 @@
+import json
+
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from ..ingest import Ingestor
+from ..models import Post, Group
+
+User = get_user_model()
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=None)
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='group',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+        cache.clear()
+
+    def test_guest_pages_served_from_cache(self):
+        """Повторный запрос гостя не обращается к базе."""
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=['slug']),
+            reverse('posts:profile', args=['auth']),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        ):
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.guest_client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_holes_filled_per_user(self):
+        """Закешированная гостем страница получает шапку пользователя."""
+        url = reverse('posts:group_list', args=['slug'])
+        self.guest_client.get(url)
+        content = self.authorized_client.get(url).content.decode()
+        self.assertIn('Пользователь: auth', content)
+        self.assertNotIn('Регистрация', content)
+        content = self.guest_client.get(url).content.decode()
+        self.assertNotIn('Пользователь: auth', content)
+
+    def test_write_invalidates_pages(self):
+        """Новый пост сбрасывает закешированные страницы."""
+        url = reverse('posts:group_list', args=['slug'])
+        self.guest_client.get(url)
+        Post.objects.create(
+            author=self.user, text='Свежий пост', group=self.group
+        )
+        content = self.guest_client.get(url).content.decode()
+        self.assertIn('Свежий пост', content)
+
+    def test_writes_invalidate_only_tagged_pages(self):
+        """Комментарий и перенос поста сбрасывают только свои страницы."""
+        other = Group.objects.create(title='other', slug='other',
+                                     description='-')
+        group_url = reverse('posts:group_list', args=['slug'])
+        detail_url = reverse('posts:post_detail', args=[self.post.pk])
+        for url in (group_url, detail_url):
+            self.guest_client.get(url)
+        self.post.comments.create(author=self.user, text='Комментарий')
+        with self.assertNumQueries(0):
+            self.guest_client.get(group_url)
+        self.assertContains(self.guest_client.get(detail_url), 'Комментарий')
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = other
+        post.save()
+        self.assertNotContains(self.guest_client.get(group_url),
+                               'Тестовый пост')
+
+    def test_ingest_invalidates_pages(self):
+        """Посты, загруженные bulk_create, сразу видны на страницах."""
+        url = reverse('posts:group_list', args=['slug'])
+        self.guest_client.get(url)
+        Ingestor().run([json.dumps({
+            'type': 'post', 'author': 'auth', 'text': 'Загруженный пост',
+            'group': 'slug',
+        })])
+        self.assertContains(self.guest_client.get(url), 'Загруженный пост')
+
+    def test_signup_keeps_pages_cached(self):
+        """Новый пользователь не сбрасывает кеш страниц."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        User.objects.create_user(username='newcomer')
+        with self.assertNumQueries(0):
+            self.guest_client.get(url)
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.test import TestCase, Client
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from .. import popular
+from ..models import Post
+
+User = get_user_model()
+
+
+class PopularTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.posts = [
+            Post.objects.create(author=cls.user, text=f'пост {i}')
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        popular.merge()
+        cache.clear()
+        self.client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_score_decays_with_time(self):
+        """Свежие события весят больше старых того же размера."""
+        old, new, _ = self.posts
+        popular.record_event(old.pk, 3, now=0)
+        popular.record_event(new.pk, 1, now=popular.HALF_LIFE)
+        popular.merge()
+        self.assertEqual(popular.top_posts(), [old.pk, new.pk])
+        popular.record_event(new.pk, 1, now=popular.HALF_LIFE * 2)
+        popular.merge()
+        self.assertEqual(popular.top_posts(), [new.pk, old.pk])
+
+    def test_capacity_is_bounded(self):
+        """Словарь оценок не растёт больше CAPACITY."""
+        with mock.patch.object(popular, 'CAPACITY', 2):
+            for post_id, weight in ((1, 5), (2, 1), (3, 1), (3, 1)):
+                popular.record_event(post_id, weight, now=0)
+            popular.merge()
+        self.assertEqual(popular.top_posts(), [1, 3])
+
+    def test_views_and_comments_rank_feed(self):
+        """Просмотры и комментарии поднимают пост в популярной ленте."""
+        first, second, third = self.posts
+        for _ in range(3):
+            self.client.get(reverse('posts:post_detail', args=[second.pk]))
+        self.client.get(reverse('posts:post_detail', args=[third.pk]))
+        self.authorized_client.post(
+            reverse('posts:add_comment', args=[first.pk]),
+            {'text': 'комментарий'}
+        )
+        popular.merge()
+        response = self.client.get(reverse('posts:popular'))
+        self.assertEqual(
+            list(response.context['page_obj']), [first, second, third]
+        )
+        Post.objects.filter(pk=first.pk).delete()
+        self.assertEqual(popular.top_posts(), [second.pk, third.pk])
+
+    def test_events_buffered_until_merge(self):
+        """События копятся в процессе и не трогают кеш до слияния."""
+        first, second, _ = self.posts
+        with mock.patch.object(popular.cache, 'set') as cache_set:
+            for _ in range(3):
+                popular.record_event(first.pk, 1)
+            popular.record_event(second.pk, 1)
+        cache_set.assert_not_called()
+        self.assertEqual(popular.top_posts(), [])
+        self.assertEqual(popular.merge(), 2)
+        self.assertEqual(popular.top_posts(), [first.pk, second.pk])
@@ -0,0 +1,60 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.core.cache import cache
+
+from ..models import Post, Group
+from ..templatetags.post_tags import posts, fragment_key
+
+User = get_user_model()
+
+
+class PostsTagTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='автор')
+        cls.group = Group.objects.create(
+            title='group',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Пост в группе', group=cls.group
+        )
+        cls.other = Post.objects.create(author=cls.user, text='Без группы')
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.get(pk=self.post.pk)
+
+    def test_urls_match_reverse(self):
+        """Собранные склейкой URL совпадают с reverse()."""
+        html = ''.join(posts([self.post, self.other]))
+        for url in (
+            reverse('posts:profile', args=[self.user.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+            reverse('posts:post_detail', args=[self.other.pk]),
+            reverse('posts:group_list', args=[self.group.slug]),
+        ):
+            with self.subTest(url=url):
+                self.assertIn(f'href="{url}"', html)
+
+    def test_fragment_refreshed_after_edit(self):
+        """Фрагмент поста перерисовывается после изменения поста."""
+        self.assertIn('Пост в группе', ''.join(posts([self.post])))
+        self.post.text = 'Новый текст'
+        self.post.save()
+        self.assertIn('Новый текст', ''.join(posts([self.post])))
+
+    def test_fragments_shared_through_cache(self):
+        """Фрагменты лежат в общем кеше и меняют ключ при смене группы."""
+        key = fragment_key(self.post)
+        posts([self.post])
+        self.assertIn('Пост в группе', cache.get(key))
+        group = self.post.group
+        group.slug = 'new-slug'
+        group.save()
+        self.assertNotEqual(fragment_key(self.post), key)
+        html = ''.join(posts([self.post]))
+        self.assertIn(reverse('posts:group_list', args=['new-slug']), html)
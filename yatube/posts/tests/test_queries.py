@@ -0,0 +1,60 @@
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Post, Group, Comment, Follow
+
+User = get_user_model()
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=None)
+class QueryCountTests(TestCase):
+    """Число запросов на страницу не растёт вместе с числом постов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=cls.reader, author=cls.user)
+        cls.group = Group.objects.create(
+            title='group',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост', group=cls.group
+        )
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        return len(queries)
+
+    def test_feeds_have_constant_query_count(self):
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=['slug']),
+            reverse('posts:profile', args=['auth']),
+            reverse('posts:follow_index'),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+        before = [self.count_queries(url) for url in urls]
+        Post.objects.bulk_create(
+            [Post(author=self.user, text='Ещё пост', group=self.group)
+             for _ in range(9)]
+        )
+        Comment.objects.bulk_create(
+            [Comment(post=self.post, author=author, text='Комментарий')
+             for author in (self.user, self.reader) * 5]
+        )
+        after = [self.count_queries(url) for url in urls]
+        self.assertEqual(dict(zip(urls, before)), dict(zip(urls, after)))
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.conf import settings
+
+from ..models import Post, Group
+from ..sitemaps import build_sitemaps
+
+TEMP_SITEMAP_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+User = get_user_model()
+
+
+class SitemapTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        User.objects.create_user(username='silent')
+        Group.objects.create(
+            title='group',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        Post.objects.bulk_create(
+            [Post(author=cls.user, text='Тестовый пост') for _ in range(5)]
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_SITEMAP_ROOT, ignore_errors=True)
+
+    def test_build_sitemaps(self):
+        """Разделы режутся на файлы по limit, индекс ссылается на все."""
+        names = build_sitemaps(TEMP_SITEMAP_ROOT, 'http://x/', limit=2)
+        self.assertEqual(names, [
+            'sitemap-posts-1.xml',
+            'sitemap-posts-2.xml',
+            'sitemap-posts-3.xml',
+            'sitemap-groups-4.xml',
+            'sitemap-profiles-5.xml',
+        ])
+        with open(os.path.join(TEMP_SITEMAP_ROOT, 'sitemap.xml')) as file:
+            index = file.read()
+        for name in names:
+            with self.subTest(name=name):
+                self.assertIn(f'<loc>http://x/{name}</loc>', index)
+        path = os.path.join(TEMP_SITEMAP_ROOT, 'sitemap-profiles-5.xml')
+        with open(path) as file:
+            profiles = file.read()
+        self.assertIn('http://x/profile/auth/', profiles)
+        self.assertNotIn('silent', profiles)
+
+    def test_rebuild_removes_stale_chunks(self):
+        """Пересборка удаляет лишние разделы и не оставляет временных."""
+        build_sitemaps(TEMP_SITEMAP_ROOT, 'http://x/', limit=2)
+        names = build_sitemaps(TEMP_SITEMAP_ROOT, 'http://x/', limit=10)
+        self.assertEqual(
+            sorted(os.listdir(TEMP_SITEMAP_ROOT)),
+            sorted(names + ['sitemap.xml'])
+        )
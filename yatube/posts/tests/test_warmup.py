@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.test import TestCase, Client, override_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from ..models import Follow, Post, Group
+from ..warmup import rewarm, warm, warm_paths
+
+User = get_user_model()
+
+
+@override_settings(INVALIDATION_POLL_INTERVAL=None)
+class WarmupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='group', slug='slug', description='-'
+        )
+        for i in range(25):
+            Post.objects.create(author=cls.user, text=f'пост {i}',
+                                group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_fills_page_cache(self):
+        """После прогрева ленты, группы и профили отдаются из кеша."""
+        paths = warm_paths(pages=3, groups=5, profiles=5)
+        self.assertEqual(paths, [
+            '/', '/?page=2', '/?page=3', '/group/slug/', '/profile/auth/'
+        ])
+        _, hit_rate = warm(paths)
+        self.assertEqual(hit_rate, 1.0)
+        client = Client()
+        for path in paths:
+            with self.subTest(path=path), self.assertNumQueries(0):
+                client.get(path)
+
+    @override_settings(CACHE_WARM_ON_INVALIDATION=True)
+    def test_rewarm_after_invalidation(self):
+        """Запись поста после коммита запускает фоновый прогрев."""
+        with mock.patch('posts.warmup.transaction.on_commit',
+                        lambda func: func()), \
+                mock.patch('posts.warmup.warm_in_background') as warm_later:
+            self.client.get(reverse('posts:index'))
+            warm_later.assert_not_called()
+            Post.objects.create(author=self.user, text='новый пост')
+        warm_later.assert_called()
+
+    @override_settings(CACHE_WARM_ON_INVALIDATION=True)
+    def test_rewarm_only_for_warmed_pages(self):
+        """Сбросы, не задевшие прогреваемые страницы, прогрев не зовут."""
+        other = User.objects.create_user(username='other')
+        post = Post.objects.first()
+        with mock.patch('posts.warmup.transaction.on_commit',
+                        lambda func: func()), \
+                mock.patch('posts.warmup.warm_in_background') as warm_later:
+            post.comments.create(author=other, text='комментарий')
+            Follow.objects.create(user=self.user, author=other)
+            warm_later.assert_not_called()
+            with self.assertNumQueries(0):
+                rewarm({f'author:{other.pk}'})
+            rewarm({f'author:{self.user.pk}'})
+            warm_later.assert_called_once()
@@ -1,11 +1,12 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
@@ -15,6 +16,7 @@ urlpatterns = [
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'),
+    path('popular/', views.popular_index, name='popular'),
     path('follow/', views.follow_index, name='follow_index'),
     path(
         'profile/<str:username>/follow/',
@@ -26,4 +28,12 @@ urlpatterns = [
         views.profile_unfollow,
         name='profile_unfollow'
     ),
+    path('export/<str:kind>/', views.export, name='export'),
+    path('feed/<str:fmt>/', feeds.feed, name='feed'),
+    path('group/<slug:slug>/feed/<str:fmt>/', feeds.feed, name='group_feed'),
+    path(
+        'profile/<str:username>/feed/<str:fmt>/',
+        feeds.feed,
+        name='profile_feed'
+    ),
 ]
@@ -1,42 +1,82 @@
 
 from django.shortcuts import redirect, render, get_object_or_404
 from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.http import (
+    Http404, HttpResponseBadRequest, StreamingHttpResponse
+)
 from .models import Post, Group, Follow, User
 from .forms import PostForm, CommentForm
+from .export import EXPORTS, FORMATS, export_rows, parse_day, render_rows
+from .groups import (
+    GROUPS_TAG, POSTS_PER_PAGE, POSTS_TAG, first_page, get_group
+)
+from . import popular
+from .counters import counts_views
+from core.page_cache import depends_on, page_cache
+from core.ratelimit import rate_limit
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 
 
 def get_page_context_paginator(queryset, request):
-    paginator = Paginator(queryset, 10)
+    paginator = Paginator(queryset, POSTS_PER_PAGE)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
 
 
+@page_cache()
 def index(request):
-    posts = Post.objects.all()
+    posts = Post.objects.select_related('author', 'group')
     page_obj = get_page_context_paginator(posts, request)
     context = {
         'page_obj': page_obj
     }
-    return render(request, 'posts/index.html', context)
+    return depends_on(
+        render(request, 'posts/index.html', context), POSTS_TAG
+    )
+
+
+@page_cache()
+def group_index(request):
+    groups = Group.objects.annotate(
+        post_count=Count('posts_group'),
+        last_activity=Max('posts_group__pub_date'),
+    ).order_by('-post_count', 'title')
+    context = {
+        'page_obj': get_page_context_paginator(groups, request),
+    }
+    return depends_on(
+        render(request, 'posts/group_index.html', context),
+        POSTS_TAG, GROUPS_TAG
+    )
 
 
+@page_cache()
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts_group.all()
-    page_obj = get_page_context_paginator(posts, request)
+    group = get_group(slug)
+    page_obj = None
+    if request.GET.get('page') in (None, '', '1'):
+        page_obj = first_page(group)
+    if page_obj is None:
+        posts = group.posts_group.select_related('author', 'group')
+        page_obj = get_page_context_paginator(posts, request)
     context = {
         'group': group,
         'page_obj': page_obj,
     }
-    return render(request, 'posts/group_list.html', context)
+    return depends_on(
+        render(request, 'posts/group_list.html', context),
+        f'group:{group.slug}'
+    )
 
 
+@page_cache(authenticated=False)
 def profile(request, username):
     author = get_object_or_404(User, username=username)
     page_obj = get_page_context_paginator(
-        Post.objects.filter(author=author),
+        author.posts.select_related('author', 'group'),
         request
     )
     current_user = request.user
@@ -46,23 +86,32 @@ def profile(request, username):
         'page_obj': page_obj,
         'following': following,
     }
-    return render(request, 'posts/profile.html', context)
+    return depends_on(
+        render(request, 'posts/profile.html', context),
+        f'author:{author.pk}'
+    )
 
 
+@counts_views
+@page_cache(authenticated=False)
 def post_detail(request, post_id):
     related = Post.objects.select_related('author', 'group')
     post = get_object_or_404(related, pk=post_id)
     form = CommentForm()
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
     context = {
         'post': post,
         'form': form,
         'comments': comments,
     }
-    return render(request, 'posts/post_detail.html', context)
+    return depends_on(
+        render(request, 'posts/post_detail.html', context),
+        f'post:{post.pk}', f'author:{post.author_id}'
+    )
 
 
 @login_required
+@rate_limit('post_create')
 def post_create(request):
     form = PostForm(
         request.POST or None,
@@ -99,6 +148,7 @@ def post_edit(request, post_id):
 
 
 @login_required
+@rate_limit('add_comment')
 def add_comment(request, post_id):
     post = get_object_or_404(
         Post.objects.select_related('group', 'author'),
@@ -110,12 +160,29 @@ def add_comment(request, post_id):
         comment.author = request.user
         comment.post = post
         comment.save()
+        popular.record_event(post.pk, popular.COMMENT_WEIGHT)
     return redirect('posts:post_detail', post_id=post_id)
 
 
+def popular_index(request):
+    page_obj = get_page_context_paginator(popular.top_posts(), request)
+    posts = Post.objects.select_related('author', 'group').in_bulk(
+        page_obj.object_list
+    )
+    page_obj.object_list = [
+        posts[pk] for pk in page_obj.object_list if pk in posts
+    ]
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/popular.html', context)
+
+
 @login_required
 def follow_index(request):
-    posts_list = Post.objects.filter(author__following__user=request.user)
+    posts_list = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('author', 'group')
     page_obj = get_page_context_paginator(posts_list, request)
     context = {
         'page_obj': page_obj,
@@ -124,6 +191,7 @@ def follow_index(request):
 
 
 @login_required
+@rate_limit('profile_follow', methods=('GET', 'POST'))
 def profile_follow(request, username):
     author = User.objects.get(username=username)
     current_user = request.user
@@ -148,3 +216,34 @@ def profile_unfollow(request, username):
         'posts:profile',
         username
     )
+
+
+@staff_member_required
+def export(request, kind):
+    if kind not in EXPORTS:
+        raise Http404
+    fmt = request.GET.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        fmt = 'ndjson'
+    date_from = request.GET.get('date_from')
+    date_to = request.GET.get('date_to')
+    try:
+        date_from = parse_day(date_from) if date_from else None
+        date_to = parse_day(date_to) if date_to else None
+    except ValueError:
+        return HttpResponseBadRequest('Неверная дата')
+    rows = export_rows(
+        kind,
+        author=request.GET.get('author'),
+        group=request.GET.get('group'),
+        date_from=date_from,
+        date_to=date_to,
+    )
+    response = StreamingHttpResponse(
+        render_rows(kind, rows, fmt),
+        content_type='text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{kind}.{fmt}"'
+    )
+    return response
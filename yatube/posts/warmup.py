@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, transaction
+from django.db.models import Count
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from core.invalidation import get_tagged, subscribe
+from core.page_cache import PAGES_TAG, page_key
+
+from .groups import HOT_TIMEOUT, HOT_WINDOW, POSTS_TAG, hot_groups
+from .models import Post
+
+WARM_DELAY = 1
+
+_lock = threading.Lock()
+_state = {'scheduled': False}
+
+
+def top_authors(limit):
+    """[(id, username)] самых активных авторов за HOT_WINDOW, из кеша."""
+    key = f'warmup:top_authors:{limit}'
+    authors = cache.get(key)
+    if authors is None:
+        authors = list(
+            Post.objects.filter(pub_date__gte=timezone.now() - HOT_WINDOW)
+            .values_list('author_id', 'author__username')
+            .annotate(posts=Count('pk'))
+            .order_by('-posts')[:limit]
+        )
+        authors = [(pk, username) for pk, username, *_ in authors]
+        cache.set(key, authors, HOT_TIMEOUT)
+    return authors
+
+
+def warm_paths(pages, groups, profiles):
+    """Адреса для прогрева: лента, самые активные группы и авторы."""
+    index = reverse('posts:index')
+    paths = [index] + [f'{index}?page={n}' for n in range(2, pages + 1)]
+    paths += [reverse('posts:group_list', args=[slug])
+              for slug in hot_groups()[:groups]]
+    paths += [reverse('posts:profile', args=[username])
+              for _, username in top_authors(profiles)]
+    return paths
+
+
+def _guest_request(path):
+    # Без django.test: он тянет unittest и заметно удлиняет старт.
+    url = urlsplit(path)
+    return WSGIRequest({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'wsgi.input': BytesIO(),
+        'wsgi.url_scheme': 'http',
+    })
+
+
+def _render(path, threaded):
+    request = _guest_request(path)
+    request.user = AnonymousUser()
+    match = resolve(request.path_info)
+    try:
+        match.func(request, *match.args, **match.kwargs)
+    finally:
+        if threaded:
+            connection.close()
+
+
+def warm(paths, threads=1):
+    """Рендерит страницы гостем, чтобы они легли в кеш страниц.
+
+    Уже закешированные страницы отдаются из кеша и почти ничего не
+    стоят. Возвращает (секунды, доля адресов, найденных в кеше сразу
+    после прогрева).
+    """
+    started = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda path: _render(path, True), paths))
+    else:
+        for path in paths:
+            _render(path, False)
+    elapsed = time.perf_counter() - started
+    hits = sum(get_tagged(page_key(path)) is not None for path in paths)
+    return elapsed, hits / len(paths) if paths else 1.0
+
+
+def _warm_later(delay):
+    time.sleep(delay)
+    with _lock:
+        _state['scheduled'] = False
+    options = settings.CACHE_WARMUP
+    try:
+        warm(
+            warm_paths(options['pages'], options['groups'],
+                       options['profiles']),
+            options['threads'],
+        )
+    finally:
+        connection.close()
+
+
+def warm_in_background(delay=0):
+    """Прогревает кеш в фоновом потоке.
+
+    Вызовы, пришедшие до начала прогрева, схлопываются в один.
+    """
+    with _lock:
+        if _state['scheduled']:
+            return
+        _state['scheduled'] = True
+    threading.Thread(target=_warm_later, args=(delay,), daemon=True).start()
+
+
+def _touches_warm_pages(tags):
+    if tags & {POSTS_TAG, PAGES_TAG}:
+        return True
+    options = settings.CACHE_WARMUP
+    warmed = {f'group:{slug}' for slug in hot_groups()[:options['groups']]}
+    warmed |= {f'author:{pk}' for pk, _ in top_authors(options['profiles'])}
+    return bool(tags & warmed)
+
+
+@subscribe
+def rewarm(tags):
+    """После сброса прогретых страниц прогревает их снова.
+
+    Комментарии, подписки и прочие сбросы, не задевшие прогреваемые
+    страницы, прогрев не запускают.
+    """
+    if (settings.CACHE_WARM_ON_INVALIDATION
+            and _touches_warm_pages(set(tags))):
+        transaction.on_commit(lambda: warm_in_background(WARM_DELAY))
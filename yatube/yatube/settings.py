@@ -23,7 +23,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SECRET_KEY = '&xmcv&q2c62!b2*92pm(p5c0$(8c@8dl9bn^!=6d06sgv+lq3q'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv('DEBUG', '1') == '1'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -57,6 +57,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.HashingOverloadMiddleware',
+    'core.middleware.InvalidationMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
@@ -65,11 +67,22 @@ STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# Вне DEBUG шаблоны разбираются один раз на процесс и хранятся в памяти,
+# а не читаются с диска на каждый {% include %}.
+if not DEBUG:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -78,6 +91,7 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
             ],
+            'loaders': TEMPLATE_LOADERS,
         },
     },
 ]
@@ -96,6 +110,34 @@ DATABASES = {
 }
 
 
+# Сессии и пользователь сессии читаются из кеша, в БД — только запись.
+# Для сессий совсем без БД задайте SESSION_ENGINE
+# django.contrib.sessions.backends.signed_cookies.
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
+
+# Хеширование паролей ограничено PASSWORD_HASHING_CONCURRENCY слотами
+# на процесс, чтобы всплеск входов не занимал все потоки воркера.
+# PASSWORD_HASHER=argon2 включает Argon2 (нужен пакет argon2-cffi),
+# старые PBKDF2-хеши продолжают проверяться.
+PASSWORD_HASHING_CONCURRENCY = int(
+    os.getenv('PASSWORD_HASHING_CONCURRENCY', '2')
+)
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(
+    os.getenv('PASSWORD_HASHING_QUEUE_TIMEOUT', '2')
+)
+PASSWORD_HASHERS = [
+    'core.hashers.LimitedPBKDF2PasswordHasher',
+    'core.hashers.LimitedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+if os.getenv('PASSWORD_HASHER') == 'argon2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -140,8 +182,12 @@ LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 # LOGOUT_REDIRECT_URL = 'posts:index'
 
-# filebased.EmailBackend
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма попадают в очередь core.OutboxMessage, отправляет их
+# manage.py send_outbox через OUTBOX_EMAIL_BACKEND (SMTP в проде).
+EMAIL_BACKEND = 'core.outbox.OutboxEmailBackend'
+OUTBOX_EMAIL_BACKEND = os.getenv(
+    'OUTBOX_EMAIL_BACKEND', 'django.core.mail.backends.filebased.EmailBackend'
+)
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 # Static files (CSS, JavaScript, Images)
@@ -155,4 +201,37 @@ CACHES = {
     }
 }
 
+# sitemap.xml и файлы разделов, см. manage.py build_sitemaps
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITEMAP_BASE_URL = 'http://localhost:8000'
+
+# Лимиты запросов на запись, см. core.ratelimit.rate_limit
+RATE_LIMITS = {
+    'post_create': {'user': '20/m', 'ip': '100/m'},
+    'add_comment': {'user': '30/m', 'ip': '100/m'},
+    'profile_follow': {'user': '30/m', 'ip': '100/m'},
+    'signup': {'ip': '10/h'},
+}
+
+# Просмотры постов копятся в памяти и пишутся в базу одним UPDATE
+# не чаще раза в столько секунд, см. posts.counters.ViewCounter
+VIEW_COUNT_FLUSH_INTERVAL = 5
+
+# События популярности копятся в памяти и сливаются в общий рейтинг
+# не чаще раза в столько секунд, см. posts.popular.merge
+POPULAR_MERGE_INTERVAL = 5
+
+# Как часто узел читает журнал сбросов кеша других узлов, в секундах;
+# None — узел один и журнал читать не нужно, см. core.invalidation.poll
+INVALIDATION_POLL_INTERVAL = 1
+
+# Прогрев кеша страниц: первые pages страниц ленты, первые страницы
+# groups групп и profiles авторов в threads потоков; при старте воркера
+# и после сбросов кеша, см. posts.warmup и manage.py warm_cache
+CACHE_WARMUP = {'pages': 3, 'groups': 5, 'profiles': 5, 'threads': 4}
+CACHE_WARM_ON_INVALIDATION = not DEBUG
+
+# Бюджет холодного старта воркера, мс, см. manage.py profile_startup
+STARTUP_BUDGET_MS = 750
+
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
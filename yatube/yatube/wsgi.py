@@ -7,10 +7,33 @@ For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
 
+import atexit
 import os
-
-from django.core.wsgi import get_wsgi_application
+import sys
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+if sys.version_info < (3, 12):
+    # См. manage.py: стандартный distutils вместо копии из setuptools.
+    os.environ.setdefault('SETUPTOOLS_USE_DISTUTILS', 'stdlib')
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+from posts import popular  # noqa: E402
+from posts.counters import view_counter  # noqa: E402
+
+atexit.register(view_counter.flush)
+atexit.register(popular.merge)
+
+if not settings.DEBUG:
+    from core.warmup import warm_templates
+    from posts.warmup import warm_in_background
+
+    # Шаблоны прогреваются до fork и делятся воркерами. Прогрев кеша
+    # ходит в базу из потока, поэтому при preload он запускается уже
+    # в воркере, см. gunicorn.conf.py.
+    warm_templates()
+    if os.getenv('YATUBE_PRELOAD') != '1':
+        warm_in_background()